@@ -12,6 +12,7 @@ Since: 1.0.0
 import subprocess
 import re
 import shutil
+import threading
 from mcp_commons.exception import McpCommonsError
 from mcp_commons.util import setup_logger
 
@@ -21,6 +22,9 @@ logger = setup_logger(__name__)
 _TLS_1_2_PROTOCOL = 3072
 _PACKAGE_NAME_INDEX = 0
 _PACKAGE_VERSION_INDEX = 1
+# Tool calls run in worker threads. Changes are run one at a time, since Windows
+# Installer and Chocolatey's own lock file fail a second concurrent change.
+_change_lock = threading.Lock()
 
 
 class ChocolateyNotInstalledError(McpCommonsError):
@@ -56,7 +60,7 @@ def install_chocolatey() -> bool:
             f'-ArgumentList "-Command {install_command}" -Verb RunAs -Wait'
         )
 
-        with subprocess.Popen(
+        with _change_lock, subprocess.Popen(
             ["powershell.exe", "-Command", elevated_command],
             stdin=None,
             stdout=None,
@@ -221,7 +225,7 @@ def _run_elevated_choco_command(command: str) -> bool:
     try:
         logger.info("Running elevated Chocolatey command: %s", command)
         powershell_command = f'Start-Process -FilePath "choco" -ArgumentList "{command}" -Verb RunAs -Wait'
-        with subprocess.Popen(
+        with _change_lock, subprocess.Popen(
             ["powershell.exe", "-Command", powershell_command],
             stdin=None,
             stdout=None,
@@ -1,6 +1,7 @@
 import unittest
 import subprocess
 from unittest.mock import patch, MagicMock
+from mcp_server_choco import service
 from mcp_server_choco.service import (
     install_chocolatey,
     list_installed_packages,
@@ -225,6 +226,20 @@ class TestChocolateyService(unittest.TestCase):
         self.assertEqual(args[0][0], 'powershell.exe')
         self.assertTrue('install -y test-package' in args[0][2])
 
+    @patch('subprocess.Popen')
+    @patch('shutil.which')
+    def test_install_package_holds_change_lock(self, mock_which, mock_popen):
+        # Changes must not run concurrently from the server's worker threads
+        mock_which.return_value = "/path/to/choco"
+        mock_process = MagicMock()
+        mock_process.returncode = 0
+        mock_popen.return_value.__enter__.return_value = mock_process
+        mock_process.wait.side_effect = lambda: self.assertTrue(service._change_lock.locked())
+
+        self.assertTrue(install_package("test-package"))
+        mock_process.wait.assert_called_once()
+        self.assertFalse(service._change_lock.locked())
+
     @patch('subprocess.Popen')
     @patch('shutil.which')
     def test_install_package_failure(self, mock_which, mock_popen):
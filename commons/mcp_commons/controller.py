@@ -10,7 +10,7 @@ Since: 1.0.0
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
 from typing import Any
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from mcp.types import Tool, TextContent
 from mcp_commons.exception import McpCommonsError
 from .util import setup_logger
@@ -31,17 +31,26 @@ class BaseController(BaseModel):
     description: str
     input_schema: dict[str, Any]
 
+    _tool: Tool | None = PrivateAttr(default=None)
+
     def tool(self) -> Tool:
         """Create a Tool object representing this controller.
 
+        The Tool is built on the first call and reused afterwards, since the name,
+        description and input schema of a controller do not change.
+
         Returns:
             Tool: A Tool object with valid name, description, and input schema.
         """
 
-        logger.debug("Creating tool for controller: %s", self.name)
-        return Tool(
-            name=self.name, description=self.description, inputSchema=self.input_schema
-        )
+        if self._tool is None:
+            logger.debug("Creating tool for controller: %s", self.name)
+            self._tool = Tool(
+                name=self.name,
+                description=self.description,
+                inputSchema=self.input_schema,
+            )
+        return self._tool
 
     def can_execute(self, name: str) -> bool:
         """Check if this controller can execute a given tool name.
@@ -89,6 +98,33 @@ class AbstractControllerRegistry(ABC):
         """
         raise NotImplementedError("Subclasses must implement get_registry method.")
 
+    def get_tools(self) -> Sequence[Tool]:
+        """Return the tools of all controllers in the registry.
+
+        Subclasses with a fixed set of controllers may override this to return
+        a precomputed tuple.
+
+        Returns:
+            Sequence[Tool]: The tool of each registered controller.
+        """
+        return tuple(controller.tool() for controller in self.get_registry())
+
+    def get_controller(self, name: str) -> BaseController | None:
+        """Return the controller that can execute the given tool name.
+
+        Subclasses may override this with a faster lookup.
+
+        Args:
+            name (str): The name of the tool.
+
+        Returns:
+            BaseController | None: The matching controller, or None if there is none.
+        """
+        for controller in self.get_registry():
+            if controller.can_execute(name):
+                return controller
+        return None
+
     def error_handler(
         self,
         exception: McpCommonsError,
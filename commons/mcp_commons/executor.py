@@ -44,15 +44,16 @@ def execute_tool(
     controller_registry = config.controller_registry
 
     logger.debug("Looking for controller to execute tool: %s", name)
-    for controller in controller_registry.get_registry():
-        if controller.can_execute(name):
-            logger.info("Found controller %s for tool %s", controller.name, name)
-            try:
-                return controller.execute(name, arguments)
-            except McpCommonsError as e:
-                return controller_registry.error_handler(e, controller, name, arguments)
-            except Exception as e:
-                logger.error("Error executing tool %s: %s", name, str(e))
-                raise McpError(ErrorData(message=str(e), code=500)) from e
-    logger.error("No controller found for tool: %s", name)
-    raise McpError(ErrorData(message="Unknown tool.", code=404))
+    controller = controller_registry.get_controller(name)
+    if controller is None:
+        logger.error("No controller found for tool: %s", name)
+        raise McpError(ErrorData(message="Unknown tool.", code=404))
+
+    logger.info("Found controller %s for tool %s", controller.name, name)
+    try:
+        return controller.execute(name, arguments)
+    except McpCommonsError as e:
+        return controller_registry.error_handler(e, controller, name, arguments)
+    except Exception as e:
+        logger.error("Error executing tool %s: %s", name, str(e))
+        raise McpError(ErrorData(message=str(e), code=500)) from e
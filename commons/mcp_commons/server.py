@@ -45,10 +45,7 @@ async def main(config: McpConfig) -> None:
             list[Tool]: List of available tools and their descriptions.
         """
         logger.info("Listing available tools")
-        tools = [
-            controller.tool()
-            for controller in config.controller_registry.get_registry()
-        ]
+        tools = list(config.controller_registry.get_tools())
         logger.info("Found %d tools", len(tools))
         return tools
 
@@ -71,7 +68,8 @@ async def main(config: McpConfig) -> None:
         try:
             logger.info("Executing tool: %s", name)
             logger.debug("Tool arguments: %s", arguments)
-            result = execute_tool(name, arguments, config)
+            # Tools run blocking work (e.g. subprocesses), so keep it off the event loop.
+            result = await asyncio.to_thread(execute_tool, name, arguments, config)
             logger.debug("Tool execution successful")
             return result
         except Exception as e:
@@ -27,6 +27,11 @@ def test_tool_method():
     assert tool.description == "Dummy controller"
     assert tool.inputSchema == {}
 
+def test_tool_method_reuses_tool():
+    ctrl = DummyController()
+    assert ctrl.tool() is ctrl.tool()
+    assert DummyController().tool() is not ctrl.tool()
+
 def test_can_execute():
     ctrl = DummyController()
     assert ctrl.can_execute("dummy")
@@ -51,3 +56,18 @@ def test_error_handler():
     result = reg.error_handler(err, ctrl, "dummy", {})
     assert isinstance(result, list)
     assert isinstance(result[0], TextContent)
+
+def test_get_controller_default_lookup():
+    class DummyRegistry(AbstractControllerRegistry):
+        def get_registry(self):
+            return (DummyController(),)
+    reg = DummyRegistry()
+    assert reg.get_controller("dummy").name == "dummy"
+    assert reg.get_controller("other") is None
+
+def test_get_tools_default():
+    class DummyRegistry(AbstractControllerRegistry):
+        def get_registry(self):
+            return (DummyController(),)
+    tools = DummyRegistry().get_tools()
+    assert [tool.name for tool in tools] == ["dummy"]
@@ -62,3 +62,13 @@ def test_execute_tool_unknown():
         execute_tool("notfound", {}, config)
     assert exc.value.error.message == "Unknown tool."
     assert exc.value.error.code == 404
+
+def test_execute_tool_uses_get_controller():
+    class LookupRegistry(DummyRegistry):
+        def get_registry(self):
+            raise AssertionError("get_registry should not be scanned")
+        def get_controller(self, name):
+            return DummyController() if name == "dummy" else None
+    config = McpConfig(controller_registry=LookupRegistry())
+    result = execute_tool("dummy", {}, config)
+    assert result[0].text == "ok"
@@ -197,3 +197,38 @@ def test_call_tool_logic(monkeypatch):
     result = asyncio.run(call_tool_fn("dummy", {}))
     assert isinstance(result, list)
     assert result[0].text == "ok"
+
+def test_call_tool_runs_off_event_loop(monkeypatch):
+    """Test that call_tool executes the tool in a worker thread."""
+    import threading
+    config = McpConfig(controller_registry=DummyRegistry())
+    call_result = {}
+    class DummyApp:
+        def __init__(self, *a, **kw): pass
+        def list_tools(self):
+            def decorator(fn): return fn
+            return decorator
+        def call_tool(self):
+            def decorator(fn):
+                call_result['call_tool'] = fn
+                return fn
+            return decorator
+        def create_initialization_options(self):
+            return {}
+        async def run(self, *a, **kw):
+            pass
+    class DummyStream:
+        async def __aenter__(self):
+            return (None, None)
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+    def dummy_execute_tool(n, a, c):
+        call_result['thread'] = threading.get_ident()
+        return [TextContent(type="text", text="ok")]
+    monkeypatch.setattr("mcp_commons.server.Server", DummyApp)
+    monkeypatch.setattr("mcp_commons.server.stdio_server", lambda: DummyStream())
+    monkeypatch.setattr("mcp_commons.server.execute_tool", dummy_execute_tool)
+    asyncio.run(main(config))
+    result = asyncio.run(call_result['call_tool']("dummy", {}))
+    assert result[0].text == "ok"
+    assert call_result['thread'] != threading.get_ident()
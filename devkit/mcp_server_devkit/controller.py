@@ -7,14 +7,50 @@ Author: Ron Webb
 Since: 1.0.0
 """
 
+import logging
 from collections.abc import Sequence
+from dataclasses import dataclass
 from typing import Any, Dict
 from mcp_commons.util import setup_logger
 from mcp_commons.controller import BaseController, AbstractControllerRegistry
 from mcp_commons.exception import McpCommonsError
-from mcp.types import TextContent
+from mcp.types import TextContent, Tool
 from .service import decode_jwt, generate_guid, url_encode, encode_base64, decode_base64
 
+logger = setup_logger(__name__)
+
+
+def _parse_arguments(args_type: type, arguments: dict) -> Any:
+    """
+    Parse tool arguments into the controller's argument dataclass.
+
+    Arguments the dataclass does not declare are ignored, as clients may send extra keys.
+
+    Args:
+        args_type (type): The argument dataclass of the controller.
+        arguments (dict): The arguments for the tool.
+
+    Returns:
+        Any: An instance of args_type holding the arguments.
+    """
+    fields = args_type.__dataclass_fields__
+    return args_type(
+        **{key: value for key, value in arguments.items() if key in fields}
+    )
+
+
+def _mk_text(text: str) -> TextContent:
+    """
+    Build a text content result without re-validating the trusted literal fields.
+
+    Args:
+        text (str): The text of the result.
+
+    Returns:
+        TextContent: The text content holding the given text.
+    """
+    return TextContent.model_construct(type="text", text=text)
+
 
 class EncodeBase64Controller(BaseController):
     """
@@ -38,6 +74,11 @@ class EncodeBase64Controller(BaseController):
         },
     }
 
+    @dataclass(slots=True, frozen=True)
+    class _Args:
+        text: str | None = None
+        encoding: str = "utf-8"
+
     def execute(self, name: str, arguments: dict) -> Sequence[TextContent]:
         """
         Execute the encode_base64 tool.
@@ -49,15 +90,15 @@ class EncodeBase64Controller(BaseController):
         Returns:
             Sequence[TextContent]: A sequence of TextContent objects with the base64-encoded string.
         """
-        text = arguments.get("text")
-        encoding = arguments.get("encoding", "utf-8")
-        if text is None:
+        args = _parse_arguments(self._Args, arguments)
+        if args.text is None:
             logger.error("Text is required but not provided")
             raise ValueError("Text is required.")
         try:
-            encoded = encode_base64(text, encoding=encoding)
-            logger.info("Base64-encoded value: %s", encoded)
-            return [TextContent(type="text", text=encoded)]
+            encoded = encode_base64(args.text, encoding=args.encoding)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Base64-encoded value: %s", encoded)
+            return [_mk_text(encoded)]
         except Exception as exc:
             logger.error("Failed to encode base64: %s", exc)
             raise
@@ -88,6 +129,11 @@ class DecodeBase64Controller(BaseController):
         },
     }
 
+    @dataclass(slots=True, frozen=True)
+    class _Args:
+        b64_string: str | None = None
+        encoding: str = "utf-8"
+
     def execute(self, name: str, arguments: dict) -> Sequence[TextContent]:
         """
         Execute the decode_base64 tool.
@@ -99,15 +145,15 @@ class DecodeBase64Controller(BaseController):
         Returns:
             Sequence[TextContent]: A sequence of TextContent objects with the decoded string.
         """
-        b64_string = arguments.get("b64_string")
-        encoding = arguments.get("encoding", "utf-8")
-        if b64_string is None:
+        args = _parse_arguments(self._Args, arguments)
+        if args.b64_string is None:
             logger.error("b64_string is required but not provided")
             raise ValueError("b64_string is required.")
         try:
-            decoded = decode_base64(b64_string, encoding=encoding)
-            logger.info("Base64-decoded value: %s", decoded)
-            return [TextContent(type="text", text=decoded)]
+            decoded = decode_base64(args.b64_string, encoding=args.encoding)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Base64-decoded value: %s", decoded)
+            return [_mk_text(decoded)]
         except Exception as exc:
             logger.error("Failed to decode base64: %s", exc)
             raise
@@ -130,6 +176,10 @@ class UrlEncodeController(BaseController):
         },
     }
 
+    @dataclass(slots=True, frozen=True)
+    class _Args:
+        value: str | None = None
+
     def execute(self, name: str, arguments: dict) -> Sequence[TextContent]:
         """
         Execute the url_encode tool.
@@ -141,16 +191,14 @@ class UrlEncodeController(BaseController):
         Returns:
             Sequence[TextContent]: A sequence of TextContent objects with the URL-encoded string.
         """
-        value = arguments.get("value")
-        if value is None:
+        args = _parse_arguments(self._Args, arguments)
+        if args.value is None:
             logger.error("Value is required but not provided")
             raise ValueError("Value is required.")
-        encoded = url_encode(value)
-        logger.info("URL-encoded value: %s", encoded)
-        return [TextContent(type="text", text=encoded)]
-
-
-logger = setup_logger(__name__)
+        encoded = url_encode(args.value)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("URL-encoded value: %s", encoded)
+        return [_mk_text(encoded)]
 
 
 class GenerateGuidController(BaseController):
@@ -174,6 +222,10 @@ class GenerateGuidController(BaseController):
         },
     }
 
+    @dataclass(slots=True, frozen=True)
+    class _Args:
+        delimiter: str | None = None
+
     def execute(self, name: str, arguments: dict) -> Sequence[TextContent]:
         """
         Execute the generate_guid tool.
@@ -185,10 +237,10 @@ class GenerateGuidController(BaseController):
         Returns:
             Sequence[TextContent]: A sequence of TextContent objects with the generated GUID.
         """
-        delimiter = arguments.get("delimiter")
-        guid = generate_guid(delimiter=delimiter)
+        args = _parse_arguments(self._Args, arguments)
+        guid = generate_guid(delimiter=args.delimiter)
         logger.info("Generated GUID: %s", guid)
-        return [TextContent(type="text", text=guid)]
+        return [_mk_text(guid)]
 
 
 class DecodeJWTController(BaseController):
@@ -216,6 +268,12 @@ class DecodeJWTController(BaseController):
         },
     }
 
+    @dataclass(slots=True, frozen=True)
+    class _Args:
+        token: str | None = None
+        public_key: str | None = None
+        certificate: str | None = None
+
     def execute(self, name: str, arguments: dict) -> Sequence[TextContent]:
         """
         Execute the decode_jwt tool.
@@ -227,27 +285,39 @@ class DecodeJWTController(BaseController):
         Returns:
             Sequence[TextContent]: A sequence of TextContent objects with the decoded JWT.
         """
-        token = arguments.get("token")
-        public_key = arguments.get("public_key")
-        certificate = arguments.get("certificate")
-        if not token:
+        args = _parse_arguments(self._Args, arguments)
+        if not args.token:
             logger.error("Token is required but not provided")
             raise ValueError("Token is required.")
         logger.info("Decoding JWT token")
         try:
-            decoded = decode_jwt(token, public_key=public_key, certificate=certificate)
-            logger.debug(
-                "Decoded JWT: headers=%s, data=%s, signature_verified=%s",
-                decoded.headers,
-                decoded.data,
-                decoded.signature_verified,
+            decoded = decode_jwt(
+                args.token, public_key=args.public_key, certificate=args.certificate
             )
-            return [TextContent(type="text", text=decoded.model_dump_json())]
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Decoded JWT: headers=%s, data=%s, signature_verified=%s",
+                    decoded.headers,
+                    decoded.data,
+                    decoded.signature_verified,
+                )
+            return [_mk_text(decoded.to_json())]
         except Exception as exc:
             logger.error("Failed to decode JWT: %s", exc)
             raise
 
 
+_CONTROLLERS: tuple[BaseController, ...] = (
+    DecodeJWTController(),
+    GenerateGuidController(),
+    UrlEncodeController(),
+    EncodeBase64Controller(),
+    DecodeBase64Controller(),
+)
+_CONTROLLERS_BY_NAME: dict[str, BaseController] = {c.name: c for c in _CONTROLLERS}
+_TOOLS: tuple[Tool, ...] = tuple(c.tool() for c in _CONTROLLERS)
+
+
 class ControllerRegistry(AbstractControllerRegistry):
     """
     Registry for managing controllers.
@@ -260,13 +330,28 @@ class ControllerRegistry(AbstractControllerRegistry):
         Returns:
             Sequence[BaseController]: A sequence containing all available controller instances.
         """
-        return (
-            DecodeJWTController(),
-            GenerateGuidController(),
-            UrlEncodeController(),
-            EncodeBase64Controller(),
-            DecodeBase64Controller(),
-        )
+        return _CONTROLLERS
+
+    def get_tools(self) -> Sequence[Tool]:
+        """
+        Get the tools of all registered controllers.
+
+        Returns:
+            Sequence[Tool]: The precomputed tool of each controller.
+        """
+        return _TOOLS
+
+    def get_controller(self, name: str) -> BaseController | None:
+        """
+        Get the controller for a tool name.
+
+        Args:
+            name (str): The name of the tool.
+
+        Returns:
+            BaseController | None: The matching controller, or None if there is none.
+        """
+        return _CONTROLLERS_BY_NAME.get(name)
 
     def error_handler(
         self,
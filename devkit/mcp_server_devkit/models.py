@@ -1,15 +1,22 @@
 """
-Pydantic models for mcp_server_devkit.
+Data models for mcp_server_devkit.
 
 Author: Ron Webb
 Since: 1.0.0
 """
 
+import json
+from dataclasses import dataclass
 from typing import Any
-from pydantic import BaseModel
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
-class DecodedJWT(BaseModel):
+
+@dataclass(slots=True, frozen=True)
+class DecodedJWT:
     """
     Model representing a decoded JWT token.
 
@@ -27,3 +34,24 @@ class DecodedJWT(BaseModel):
     data: dict[str, Any]
     signature: str
     signature_verified: bool | None = None
+
+    def to_json(self) -> str:
+        """
+        Serialize the decoded JWT to compact JSON.
+
+        Returns:
+            str: The JSON representation of the decoded JWT.
+        """
+        content = {
+            "headers": self.headers,
+            "data": self.data,
+            "signature": self.signature,
+            "signature_verified": self.signature_verified,
+        }
+        if orjson is not None:
+            try:
+                return orjson.dumps(content).decode("utf-8")
+            except orjson.JSONEncodeError:
+                # orjson rejects integers beyond 64 bits, which the stdlib can still serialize.
+                pass
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":"))
@@ -5,24 +5,116 @@ Author: Ron Webb
 Since: 1.0.0
 """
 
-import base64
-import json
+import copy
+import dataclasses
+import functools
 import hashlib
+import json
+import re
 import hmac
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from typing import Any
-from urllib.parse import quote
-from cryptography.x509 import load_pem_x509_certificate
-from cryptography.hazmat.primitives.serialization import (
-    Encoding,
-    PublicFormat,
-    load_pem_public_key,
-)
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import padding
+from mcp_commons.util import setup_logger
 from .models import DecodedJWT
 
+try:
+    import pybase64 as base64
+except ImportError:  # pragma: no cover
+    import base64
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+logger = setup_logger(__name__)
+
+_DECODED_JWT_CACHE_MAXSIZE = 1024
+_DECODED_JWT_CACHE_TTL = 3600.0
+_SIGNATURE_CACHE_MAXSIZE = 4096
+_SIGNATURE_CACHE_TTL = 3600.0
+_PEM_CACHE_MAXSIZE = 128
+_HMAC_CACHE_MAXSIZE = 64
+_SEGMENT_CACHE_MAXSIZE = 256
+_PADS = (b"", b"===", b"==", b"=")
+_LONG_DIGITS_RE = re.compile(rb"\d{19}")
+_URL_UNRESERVED = frozenset(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-~"
+)
+_URL_QUOTE_TABLE = [
+    chr(byte) if byte in _URL_UNRESERVED else f"%{byte:02X}" for byte in range(256)
+]
+
+_HMAC_ALGS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+if not all(alg.__name__.startswith("openssl_") for alg in _HMAC_ALGS.values()):
+    logger.warning("hashlib is not backed by OpenSSL; HMAC verification will be slower")
+
+
+class _LruCache:
+    """
+    Thread-safe LRU cache whose entries expire after a per-entry time-to-live.
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Any | None:
+        """
+        Returns the cached value for the key, or None if it is missing or expired.
+
+        Args:
+            key (bytes): The cache key.
+
+        Returns:
+            Any | None: The cached value, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: bytes, value: Any, ttl: float) -> None:
+        """
+        Stores a value, evicting the least recently used entry when full.
+
+        Args:
+            key (bytes): The cache key.
+            value (Any): The value to cache.
+            ttl (float): Seconds until the entry expires.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Removes all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+_DECODED_JWT_CACHE = _LruCache(_DECODED_JWT_CACHE_MAXSIZE)
+_SIGNATURE_CACHE = _LruCache(_SIGNATURE_CACHE_MAXSIZE)
+
 
 def url_encode(value: str) -> str:
     """
@@ -37,7 +129,10 @@ def url_encode(value: str) -> str:
     Author: Ron Webb
     Since: 1.2.0
     """
-    return quote(value, safe="")
+    if value.isascii():
+        return value.translate(_URL_QUOTE_TABLE)
+    # Each UTF-8 byte maps to one latin-1 code point, so translate can percent-encode it.
+    return value.encode("utf-8").decode("latin-1").translate(_URL_QUOTE_TABLE)
 
 
 def encode_base64(text: str, encoding: str = "utf-8") -> str:
@@ -86,10 +181,14 @@ def generate_guid(delimiter: str | None) -> str:
 
     Since: 1.1.0
     """
-    guid = str(uuid.uuid4())
-    if delimiter:
-        return delimiter.join(guid.split("-"))
-    return guid
+    guid = uuid.uuid4()
+    if not delimiter:
+        return str(guid)
+    h = guid.hex
+    return (
+        f"{h[0:8]}{delimiter}{h[8:12]}{delimiter}{h[12:16]}"
+        f"{delimiter}{h[16:20]}{delimiter}{h[20:32]}"
+    )
 
 
 def decode_jwt(
@@ -104,41 +203,35 @@ def decode_jwt(
         certificate (str, optional): The PEM certificate to extract the public key for verification.
 
     Returns:
-        DecodedJWT: A Pydantic model with 'headers', 'data', and 'signature'.
+        DecodedJWT: A model with 'headers', 'data', and 'signature'.
     """
+    cache_key = None
+    if certificate is not None or public_key is not None:
+        cache_key = _decoded_jwt_cache_key(token, public_key, certificate)
+        cached = _DECODED_JWT_CACHE.get(cache_key)
+        if cached is not None:
+            return _copy_decoded_jwt(cached)
     try:
-        parts = token.split(".")
-        if len(parts) != 3:
+        first_dot = token.find(".")
+        second_dot = token.find(".", first_dot + 1)
+        if first_dot < 0 or second_dot < 0 or token.find(".", second_dot + 1) >= 0:
             raise ValueError("Invalid JWT token format.")
 
-        def decode_segment(segment: str) -> Any:
-            pad = "=" * (-len(segment) % 4)
-            segment += pad
-            return json.loads(base64.urlsafe_b64decode(segment).decode("utf-8"))
-
-        headers = decode_segment(parts[0])
-        data = decode_segment(parts[1])
-        signature = parts[2]
+        headers = _decode_segment(token[:first_dot])
+        data = _decode_segment(token[first_dot + 1 : second_dot])
+        if not isinstance(headers, dict) or not isinstance(data, dict):
+            raise ValueError("JWT header and payload must be JSON objects.")
+        signature = token[second_dot + 1 :]
 
         signature_verified = None
-        pem_key = None
-        if certificate is not None:
-            cert = certificate.strip()
-            if not cert.startswith("-----BEGIN CERTIFICATE-----"):
-                cert = f"-----BEGIN CERTIFICATE-----\n{cert}\n-----END CERTIFICATE-----"
-            pem_key = _extract_public_key_from_certificate(cert)
-        elif public_key is not None:
-            pem = public_key.strip()
-            if not pem.startswith("-----BEGIN PUBLIC KEY-----"):
-                pem = f"-----BEGIN PUBLIC KEY-----\n{pem}\n-----END PUBLIC KEY-----"
-            pem_key = pem
+        pem_key = _resolve_pem_key(public_key, certificate)
         if pem_key:
             try:
-                _verify_jwt_signature(parts, headers, signature, pem_key)
+                _verify_jwt_signature(token[:second_dot], headers, signature, pem_key)
                 signature_verified = True
             except Exception:  # pylint: disable=broad-except
                 signature_verified = False
-        return DecodedJWT(
+        decoded = DecodedJWT(
             headers=headers,
             data=data,
             signature=signature,
@@ -146,8 +239,158 @@ def decode_jwt(
         )
     except Exception as exc:
         raise ValueError(f"Failed to decode JWT: {exc}") from exc
+    if signature_verified:
+        ttl = _decoded_jwt_cache_ttl(data)
+        if ttl > 0:
+            _DECODED_JWT_CACHE.put(cache_key, _copy_decoded_jwt(decoded), ttl)
+    return decoded
+
 
+def _copy_decoded_jwt(decoded: DecodedJWT) -> DecodedJWT:
+    """
+    Copies a decoded JWT so callers never share its mutable headers and data with the cache.
+
+    Args:
+        decoded (DecodedJWT): The decoded JWT.
+
+    Returns:
+        DecodedJWT: An equal decoded JWT with its own headers and data.
+    """
+    return dataclasses.replace(
+        decoded,
+        headers=copy.deepcopy(decoded.headers),
+        data=copy.deepcopy(decoded.data),
+    )
+
+
+def _decode_segment(segment: str) -> Any:
+    """
+    Decodes a base64url-encoded JWT segment into its JSON value.
+
+    Args:
+        segment (str): The unpadded base64url segment.
+
+    Returns:
+        Any: The parsed JSON value.
+    """
+    return _json_loads(_b64url_decode(segment))
 
+
+@functools.lru_cache(maxsize=_SEGMENT_CACHE_MAXSIZE)
+def _b64url_decode(segment: str) -> bytes:
+    """
+    Decodes an unpadded base64url string, caching results for repeated tokens.
+
+    Args:
+        segment (str): The unpadded base64url string.
+
+    Returns:
+        bytes: The decoded bytes.
+    """
+    encoded = segment.encode("ascii")
+    return base64.urlsafe_b64decode(encoded + _PADS[len(encoded) & 3])
+
+
+def _b64url_encode(raw: bytes) -> str:
+    """
+    Encodes bytes as an unpadded base64url string, as used in JWT segments.
+
+    Args:
+        raw (bytes): The bytes to encode.
+
+    Returns:
+        str: The unpadded base64url string.
+    """
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _json_loads(raw: bytes) -> Any:
+    """
+    Parses JSON bytes, using orjson when it is available and lossless.
+
+    Args:
+        raw (bytes): The UTF-8 encoded JSON document.
+
+    Returns:
+        Any: The parsed JSON value.
+    """
+    # orjson turns integers beyond 64 bits into floats; the stdlib keeps them exact.
+    if orjson is None or _LONG_DIGITS_RE.search(raw):
+        return json.loads(raw)
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # The stdlib also accepts NaN, Infinity, out of range numbers and lone surrogates.
+        return json.loads(raw)
+
+
+def _resolve_pem_key(public_key: str | None, certificate: str | None) -> str | None:
+    """
+    Resolves the PEM public key used for verification, preferring the certificate.
+
+    Args:
+        public_key (str | None): The PEM public key, with or without PEM headers.
+        certificate (str | None): The PEM certificate, with or without PEM headers.
+
+    Returns:
+        str | None: The PEM public key, or None if no key material was given.
+    """
+    if certificate is not None:
+        cert = certificate.strip()
+        if not cert.startswith("-----BEGIN CERTIFICATE-----"):
+            cert = f"-----BEGIN CERTIFICATE-----\n{cert}\n-----END CERTIFICATE-----"
+        return _extract_public_key_from_certificate(cert)
+    if public_key is not None:
+        pem = public_key.strip()
+        if not pem.startswith("-----BEGIN PUBLIC KEY-----"):
+            pem = f"-----BEGIN PUBLIC KEY-----\n{pem}\n-----END PUBLIC KEY-----"
+        return pem
+    return None
+
+
+def _decoded_jwt_cache_key(
+    token: str, public_key: str | None, certificate: str | None
+) -> bytes:
+    """
+    Builds the cache key for a token and the key material used to verify it.
+
+    Args:
+        token (str): The JWT token.
+        public_key (str | None): The PEM public key, if any.
+        certificate (str | None): The PEM certificate, if any.
+
+    Returns:
+        bytes: A digest identifying the token and key material.
+    """
+    # None and "" are different inputs: an empty certificate fails to load instead
+    # of being skipped, so the two must not share a cache entry.
+    material = "\x00".join(
+        (
+            token,
+            "" if certificate is None else f"+{certificate}",
+            "" if public_key is None else f"+{public_key}",
+        )
+    ).encode()
+    return hashlib.blake2b(material, digest_size=16).digest()
+
+
+def _decoded_jwt_cache_ttl(data: dict) -> float:
+    """
+    Computes how long a verified token may stay cached, bounded by its 'exp' claim.
+
+    Args:
+        data (dict): The decoded JWT payload.
+
+    Returns:
+        float: The time-to-live in seconds; zero or less means do not cache.
+    """
+    exp = data.get("exp") if isinstance(data, dict) else None
+    if isinstance(exp, (int, float)) and not isinstance(exp, bool):
+        return min(_DECODED_JWT_CACHE_TTL, exp - time.time())
+    return _DECODED_JWT_CACHE_TTL
+
+
+@functools.lru_cache(maxsize=_PEM_CACHE_MAXSIZE)
 def _extract_public_key_from_certificate(certificate: str) -> str:
     """
     Extracts the PEM public key from a PEM certificate.
@@ -159,7 +402,14 @@ def _extract_public_key_from_certificate(certificate: str) -> str:
         ValueError: If extraction fails.
     """
     try:
-        cert = load_pem_x509_certificate(certificate.encode(), default_backend())
+        # pylint: disable=import-outside-toplevel
+        from cryptography.x509 import load_pem_x509_certificate
+        from cryptography.hazmat.primitives.serialization import (
+            Encoding,
+            PublicFormat,
+        )
+
+        cert = load_pem_x509_certificate(certificate.encode())
         pubkey_obj = cert.public_key()
         return pubkey_obj.public_bytes(
             Encoding.PEM, PublicFormat.SubjectPublicKeyInfo
@@ -171,13 +421,13 @@ def _extract_public_key_from_certificate(certificate: str) -> str:
 
 
 def _verify_jwt_signature(
-    parts: list[str], headers: dict, signature: str, public_key: str
+    signing_input: str, headers: dict, signature: str, public_key: str
 ) -> None:
     """
     Verifies the signature of a JWT token.
 
     Args:
-        parts (list[str]): The JWT token split into header, payload, and signature.
+        signing_input (str): The signed part of the token, i.e. "<header>.<payload>".
         headers (dict): Decoded JWT headers.
         signature (str): The JWT signature (base64url encoded).
         public_key (str): The public key or secret for verification.
@@ -187,55 +437,102 @@ def _verify_jwt_signature(
         ImportError: If cryptography is required but not installed.
     """
     alg = headers.get("alg", "")
-    signing_input = f"{parts[0]}.{parts[1]}".encode("utf-8")
-    signature_bytes = base64.urlsafe_b64decode(signature + "=" * (-len(signature) % 4))
+    signed_bytes = signing_input.encode("utf-8")
+    signature_bytes = _b64url_decode(signature)
+    cache_key = hashlib.blake2b(
+        signed_bytes + b"|" + signature_bytes + b"|" + public_key.encode(),
+        digest_size=24,
+    ).digest()
+    if _SIGNATURE_CACHE.get(cache_key):
+        return
 
     if alg.startswith("HS"):
         # HMAC algorithms (HS256, HS384, HS512)
-        hash_alg = {
-            "HS256": hashlib.sha256,
-            "HS384": hashlib.sha384,
-            "HS512": hashlib.sha512,
-        }.get(alg)
+        hash_alg = _HMAC_ALGS.get(alg)
         if not hash_alg:
             raise ValueError(f"Unsupported HMAC algorithm: {alg}")
-        expected_sig = hmac.new(public_key.encode(), signing_input, hash_alg).digest()
+        mac = _primed_hmac(public_key.encode(), hash_alg).copy()
+        mac.update(signed_bytes)
+        expected_sig = mac.digest()
         if not hmac.compare_digest(expected_sig, signature_bytes):
             raise ValueError("Invalid JWT signature.")
     elif alg.startswith("RS") or alg.startswith("PS"):
         # RSA/PS algorithms (RS256, RS384, RS512, PS256, PS384, PS512)
-        hash_alg = {
-            "RS256": hashes.SHA256(),
-            "RS384": hashes.SHA384(),
-            "RS512": hashes.SHA512(),
-            "PS256": hashes.SHA256(),
-            "PS384": hashes.SHA384(),
-            "PS512": hashes.SHA512(),
-        }.get(alg)
-
-        if not hash_alg:
+        params = _rsa_verify_params().get(alg)
+        if not params:
             raise ValueError(f"Unsupported RSA/PS algorithm: {alg}")
 
-        pubkey = load_pem_public_key(public_key.encode())
+        pubkey = _load_public_key(public_key)
         try:
-            if alg.startswith("RS"):
-                pubkey.verify(
-                    signature_bytes,
-                    signing_input,
-                    padding.PKCS1v15(),
-                    hash_alg,
-                )
-            else:  # PS*
-                pubkey.verify(
-                    signature_bytes,
-                    signing_input,
-                    padding.PSS(
-                        mgf=padding.MGF1(hash_alg),
-                        salt_length=padding.PSS.MAX_LENGTH,
-                    ),
-                    hash_alg,
-                )
+            pubkey.verify(signature_bytes, signed_bytes, *params)
         except Exception as exc:
             raise ValueError("Invalid JWT signature.") from exc
     else:
         raise ValueError(f"Unsupported or insecure JWT algorithm: {alg}")
+    _SIGNATURE_CACHE.put(cache_key, True, _SIGNATURE_CACHE_TTL)
+
+
+@functools.lru_cache(maxsize=_PEM_CACHE_MAXSIZE)
+def _load_public_key(public_key: str) -> Any:
+    """
+    Loads a PEM public key, caching the parsed key object per PEM string.
+
+    Args:
+        public_key (str): The PEM public key string.
+
+    Returns:
+        Any: The parsed public key object.
+    """
+    # pylint: disable=import-outside-toplevel
+    from cryptography.hazmat.primitives.serialization import load_pem_public_key
+
+    return load_pem_public_key(public_key.encode())
+
+
+@functools.lru_cache(maxsize=_HMAC_CACHE_MAXSIZE)
+def _primed_hmac(secret: bytes, hash_alg: Any) -> hmac.HMAC:
+    """
+    Returns an HMAC already keyed with the secret, to be copied for each message.
+
+    Args:
+        secret (bytes): The HMAC secret.
+        hash_alg (Any): The hashlib constructor for the digest.
+
+    Returns:
+        hmac.HMAC: A keyed HMAC that has not absorbed any message yet.
+    """
+    return hmac.new(secret, digestmod=hash_alg)
+
+
+@functools.cache
+def _rsa_verify_params() -> dict[str, tuple[Any, Any]]:
+    """
+    Returns the padding and hash algorithm for each supported RSA/PS JWT algorithm.
+
+    The table is built on first use so cryptography is only imported when an RSA
+    signature is actually verified, and the padding and hash objects are shared
+    by every verification afterwards.
+
+    Returns:
+        dict[str, tuple[Any, Any]]: The cryptography padding and hash instances keyed by JWT algorithm.
+    """
+    # pylint: disable=import-outside-toplevel
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
+
+    sha256, sha384, sha512 = hashes.SHA256(), hashes.SHA384(), hashes.SHA512()
+    pkcs1v15 = padding.PKCS1v15()
+
+    def pss(hash_alg: Any) -> Any:
+        return padding.PSS(
+            mgf=padding.MGF1(hash_alg), salt_length=padding.PSS.MAX_LENGTH
+        )
+
+    return {
+        "RS256": (pkcs1v15, sha256),
+        "RS384": (pkcs1v15, sha384),
+        "RS512": (pkcs1v15, sha512),
+        "PS256": (pss(sha256), sha256),
+        "PS384": (pss(sha384), sha384),
+        "PS512": (pss(sha512), sha512),
+    }
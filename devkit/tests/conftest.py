@@ -0,0 +1,18 @@
+"""
+Shared pytest fixtures for the mcp_server_devkit tests.
+
+Author: Ron Webb
+Since: 1.3.0
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def controllers():
+    """
+    Provide the registered controller instances keyed by tool name, imported and built once per session.
+    """
+    from mcp_server_devkit.controller import ControllerRegistry
+
+    return {controller.name: controller for controller in ControllerRegistry().get_registry()}
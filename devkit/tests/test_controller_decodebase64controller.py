@@ -5,14 +5,14 @@ Author: Ron Webb
 Since: 1.3.0
 """
 import pytest
-from mcp_server_devkit.controller import DecodeBase64Controller
 from mcp.types import TextContent
 
 class TestDecodeBase64Controller:
     """Tests for the DecodeBase64Controller class."""
 
-    def setup_method(self):
-        self.controller = DecodeBase64Controller()
+    @pytest.fixture(autouse=True)
+    def use_controller(self, controllers):
+        self.controller = controllers["decode_base64"]
 
     def test_decode_base64_default_utf8(self):
         args = {"b64_string": "aGVsbG8="}
@@ -6,33 +6,40 @@ Since: 1.0.0
 """
 
 import pytest
-from mcp_server_devkit.controller import DecodeJWTController
+from mcp.types import TextContent
 
-class DummyTextContent:
-    def __init__(self, type, text):
-        self.type = type
-        self.text = text
-
-def test_decode_jwt_controller_execute_valid(monkeypatch):
+def test_decode_jwt_controller_execute_valid(controllers):
     """
     Test DecodeJWTController execute with valid token.
     """
-    controller = DecodeJWTController()
+    controller = controllers["decode_jwt"]
     token = (
         "eyJhbGciOiJub25lIiwidHlwIjoiSldUIn0."
         "eyJ1c2VyIjoicm9uIn0."
     )
-    # Patch TextContent to DummyTextContent for test
-    monkeypatch.setattr("mcp_server_devkit.controller.TextContent", DummyTextContent)
     result = controller.execute("decode_jwt", {"token": token})
     assert isinstance(result, list)
+    assert isinstance(result[0], TextContent)
     assert result[0].type == "text"
     assert '"user":"ron"' in result[0].text
 
-def test_decode_jwt_controller_execute_missing_token():
+def test_decode_jwt_controller_execute_missing_token(controllers):
     """
     Test DecodeJWTController execute with missing token argument.
     """
-    controller = DecodeJWTController()
+    controller = controllers["decode_jwt"]
     with pytest.raises(ValueError):
         controller.execute("decode_jwt", {})
+
+def test_decode_jwt_controller_execute_large_integer_claim(controllers):
+    """
+    Test DecodeJWTController execute serializes claims beyond the 64-bit range.
+    """
+    controller = controllers["decode_jwt"]
+    # {"alg":"none"} . {"n":123456789012345678901234567890}
+    token = (
+        "eyJhbGciOiJub25lIn0."
+        "eyJuIjoxMjM0NTY3ODkwMTIzNDU2Nzg5MDEyMzQ1Njc4OTB9."
+    )
+    result = controller.execute("decode_jwt", {"token": token})
+    assert '"n":123456789012345678901234567890' in result[0].text
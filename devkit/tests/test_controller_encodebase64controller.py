@@ -5,14 +5,14 @@ Author: Ron Webb
 Since: 1.3.0
 """
 import pytest
-from mcp_server_devkit.controller import EncodeBase64Controller
 from mcp.types import TextContent
 
 class TestEncodeBase64Controller:
     """Tests for the EncodeBase64Controller class."""
 
-    def setup_method(self):
-        self.controller = EncodeBase64Controller()
+    @pytest.fixture(autouse=True)
+    def use_controller(self, controllers):
+        self.controller = controllers["encode_base64"]
 
     def test_encode_base64_default_utf8(self):
         args = {"text": "hello"}
@@ -44,3 +44,13 @@ class TestEncodeBase64Controller:
         args = {}
         with pytest.raises(ValueError):
             self.controller.execute("encode_base64", args)
+
+    def test_encode_base64_null_text(self):
+        args = {"text": None}
+        with pytest.raises(ValueError, match="Text is required."):
+            self.controller.execute("encode_base64", args)
+
+    def test_encode_base64_unknown_argument_ignored(self):
+        args = {"text": "hello", "unknown": "value"}
+        result = self.controller.execute("encode_base64", args)
+        assert result[0].text == "aGVsbG8="
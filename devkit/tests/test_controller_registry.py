@@ -17,6 +17,33 @@ def test_controller_registry_get_registry():
     assert isinstance(controllers, tuple)
     assert any(isinstance(c, DecodeJWTController) for c in controllers)
 
+def test_controller_registry_get_registry_reuses_instances():
+    """
+    Test ControllerRegistry get_registry returns the same controller instances on every call.
+    """
+    first = ControllerRegistry().get_registry()
+    second = ControllerRegistry().get_registry()
+    assert first is second
+    assert len({c.name for c in first}) == len(first)
+
+def test_controller_registry_get_controller():
+    """
+    Test ControllerRegistry get_controller looks up controllers by tool name.
+    """
+    registry = ControllerRegistry()
+    for controller in registry.get_registry():
+        assert registry.get_controller(controller.name) is controller
+    assert registry.get_controller("unknown") is None
+
+def test_controller_registry_get_tools():
+    """
+    Test ControllerRegistry get_tools returns the precomputed tool of each controller.
+    """
+    registry = ControllerRegistry()
+    tools = registry.get_tools()
+    assert tools is ControllerRegistry().get_tools()
+    assert [t.name for t in tools] == [c.name for c in registry.get_registry()]
+
 def test_controller_registry_error_handler_raises():
     """
     Test ControllerRegistry error_handler raises the exception.
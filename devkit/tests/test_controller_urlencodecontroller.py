@@ -5,14 +5,14 @@ Author: Ron Webb
 Since: 1.2.0
 """
 import pytest
-from mcp_server_devkit.controller import UrlEncodeController
 from mcp.types import TextContent
 
 class TestUrlEncodeController:
     """Tests for the UrlEncodeController class."""
 
-    def setup_method(self):
-        self.controller = UrlEncodeController()
+    @pytest.fixture(autouse=True)
+    def use_controller(self, controllers):
+        self.controller = controllers["url_encode"]
 
     def test_execute_url_encode_simple(self):
         result = self.controller.execute("url_encode", {"value": "hello world"})
@@ -35,12 +35,29 @@ def test_decoded_jwt_signature_verified_values():
     assert model_none.signature_verified is None
 
 
-def test_decoded_jwt_model_dump():
+def test_decoded_jwt_to_json():
     """
-    Test DecodedJWT model_dump_json method.
+    Test DecodedJWT to_json method.
     """
     model = DecodedJWT(headers={"alg": "HS256"}, data={"user": "ron"}, signature="sig", signature_verified=True)
-    json_str = model.model_dump_json()
+    json_str = model.to_json()
     assert '"alg":"HS256"' in json_str
     assert '"user":"ron"' in json_str
     assert '"signature_verified":true' in json_str
+
+
+def test_decoded_jwt_to_json_large_integer():
+    """
+    Test DecodedJWT to_json keeps integers beyond 64 bits exact.
+    """
+    model = DecodedJWT(headers={}, data={"big": 2**70}, signature="sig")
+    assert f'"big":{2**70}' in model.to_json()
+
+
+def test_decoded_jwt_is_frozen():
+    """
+    Test DecodedJWT fields cannot be reassigned.
+    """
+    model = DecodedJWT(headers={}, data={}, signature="sig")
+    with pytest.raises(AttributeError):
+        model.signature = "other"
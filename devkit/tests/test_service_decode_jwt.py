@@ -7,16 +7,30 @@ Since: 1.0.0
 
 import pytest
 from mcp_server_devkit import service
-import base64
 import json
+import time
+
+
+@pytest.fixture(autouse=True)
+def clear_decoded_jwt_cache():
+    """
+    Clear the JWT caches so verification results do not leak between tests.
+    """
+    service._DECODED_JWT_CACHE.clear()
+    service._SIGNATURE_CACHE.clear()
+    service._b64url_decode.cache_clear()
+    yield
+    service._DECODED_JWT_CACHE.clear()
+    service._SIGNATURE_CACHE.clear()
+    service._b64url_decode.cache_clear()
 
 
 def create_jwt(payload: dict) -> str:
     """
     Helper to create a fake JWT token with the given payload (no signature).
     """
-    header = base64.urlsafe_b64encode(json.dumps({"alg": "none", "typ": "JWT"}).encode()).rstrip(b'=').decode()
-    payload_b64 = base64.urlsafe_b64encode(json.dumps(payload).encode()).rstrip(b'=').decode()
+    header = service._b64url_encode(json.dumps({"alg": "none", "typ": "JWT"}).encode())
+    payload_b64 = service._b64url_encode(json.dumps(payload).encode())
     return f"{header}.{payload_b64}."
 
 
@@ -107,8 +121,8 @@ def test_decode_jwt_invalid_json_in_payload():
     """
     Test decode_jwt with invalid JSON in payload segment.
     """
-    import base64, json
-    header = base64.urlsafe_b64encode(json.dumps({"alg": "none"}).encode()).rstrip(b'=').decode()
+    import json
+    header = service._b64url_encode(json.dumps({"alg": "none"}).encode())
     token = f"{header}.aW52YWxpZA."
     with pytest.raises(ValueError):
         service.decode_jwt(token)
@@ -155,47 +169,43 @@ def test_verify_jwt_signature_unsupported_alg():
     """
     Test _verify_jwt_signature raises ValueError for unsupported algorithm.
     """
-    import base64
-    valid_sig = base64.urlsafe_b64encode(b"sig").rstrip(b'=').decode()
-    parts = ["a", "b", valid_sig]
+    valid_sig = service._b64url_encode(b"sig")
     headers = {"alg": "XYZ"}
     with pytest.raises(ValueError, match="Unsupported or insecure JWT algorithm"):
-        service._verify_jwt_signature(parts, headers, valid_sig, "key")
+        service._verify_jwt_signature("a.b", headers, valid_sig, "key")
 
 def test_verify_jwt_signature_hmac_invalid():
     """
     Test _verify_jwt_signature with HMAC and invalid signature.
     """
-    import base64, json
+    import json
     import hashlib
     import hmac
     parts = [
-        base64.urlsafe_b64encode(json.dumps({"alg": "HS256"}).encode()).rstrip(b'=').decode(),
-        base64.urlsafe_b64encode(json.dumps({"foo": "bar"}).encode()).rstrip(b'=').decode(),
-        base64.urlsafe_b64encode(b"bad_signature").rstrip(b'=').decode(),
+        service._b64url_encode(json.dumps({"alg": "HS256"}).encode()),
+        service._b64url_encode(json.dumps({"foo": "bar"}).encode()),
+        service._b64url_encode(b"bad_signature"),
     ]
     headers = {"alg": "HS256"}
     signature = parts[2]
     # Use wrong key so signature won't match
     with pytest.raises(ValueError, match="Invalid JWT signature"):
-        service._verify_jwt_signature(parts, headers, signature, "wrongkey")
+        service._verify_jwt_signature(f"{parts[0]}.{parts[1]}", headers, signature, "wrongkey")
 
 def test_verify_jwt_signature_rsa_unsupported(monkeypatch):
     """
     Test _verify_jwt_signature with unsupported RSA algorithm.
     """
-    import base64
-    valid_sig = base64.urlsafe_b64encode(b"sig").rstrip(b'=').decode()
-    parts = ["a", "b", valid_sig]
+    valid_sig = service._b64url_encode(b"sig")
     headers = {"alg": "RS999"}
     with pytest.raises(ValueError, match="Unsupported RSA/PS algorithm"):
-        service._verify_jwt_signature(parts, headers, valid_sig, "key")
+        service._verify_jwt_signature("a.b", headers, valid_sig, "key")
 
 def test_verify_jwt_signature_ps(monkeypatch):
     """
     Test _verify_jwt_signature with PS algorithm and verification error.
     """
-    import base64, json
+    import json
     from cryptography.hazmat.primitives.asymmetric import rsa
     from cryptography.hazmat.primitives import serialization
     from cryptography.hazmat.primitives.asymmetric import padding
@@ -206,11 +216,258 @@ def test_verify_jwt_signature_ps(monkeypatch):
         encoding=serialization.Encoding.PEM,
         format=serialization.PublicFormat.SubjectPublicKeyInfo
     ).decode()
-    header = base64.urlsafe_b64encode(json.dumps({"alg": "PS256"}).encode()).rstrip(b'=').decode()
-    payload = base64.urlsafe_b64encode(json.dumps({"foo": "bar"}).encode()).rstrip(b'=').decode()
-    signature = base64.urlsafe_b64encode(b"bad_signature").rstrip(b'=').decode()
+    header = service._b64url_encode(json.dumps({"alg": "PS256"}).encode())
+    payload = service._b64url_encode(json.dumps({"foo": "bar"}).encode())
+    signature = service._b64url_encode(b"bad_signature")
     parts = [header, payload, signature]
     headers = {"alg": "PS256"}
     # Should raise ValueError due to invalid signature
     with pytest.raises(ValueError, match="Invalid JWT signature"):
-        service._verify_jwt_signature(parts, headers, signature, pubkey)
+        service._verify_jwt_signature(f"{parts[0]}.{parts[1]}", headers, signature, pubkey)
+
+
+def test_decode_jwt_verified_result_is_cached(monkeypatch):
+    """
+    Test decode_jwt serves a verified token from the cache on repeated calls.
+    """
+    token = create_jwt({"user": "ron", "exp": int(time.time()) + 60})
+    calls = []
+    monkeypatch.setattr(service, "_verify_jwt_signature", lambda p, h, s, k: calls.append(k))
+    first = service.decode_jwt(token, public_key="FAKEPUBKEYDATA")
+    second = service.decode_jwt(token, public_key="FAKEPUBKEYDATA")
+    assert first == second
+    assert first.signature_verified is True
+    assert len(calls) == 1
+
+def test_decode_jwt_cached_result_is_not_shared(monkeypatch):
+    """
+    Test decode_jwt hands out copies, so mutating a result does not change the cache.
+    """
+    token = create_jwt({"user": "ron", "roles": ["admin"]})
+    monkeypatch.setattr(service, "_verify_jwt_signature", lambda p, h, s, k: None)
+    first = service.decode_jwt(token, public_key="FAKEPUBKEYDATA")
+    first.data["roles"].append("root")
+    first.headers["alg"] = "HS256"
+    second = service.decode_jwt(token, public_key="FAKEPUBKEYDATA")
+    assert second.data == {"user": "ron", "roles": ["admin"]}
+    assert second.headers["alg"] == "none"
+
+def test_decode_jwt_cache_distinguishes_empty_certificate(monkeypatch):
+    """
+    Test an empty certificate is not served the cached result of a call without one.
+    """
+    token = create_jwt({"user": "ron"})
+    monkeypatch.setattr(service, "_verify_jwt_signature", lambda p, h, s, k: None)
+    assert service.decode_jwt(token, public_key="FAKEPUBKEYDATA").signature_verified is True
+    with pytest.raises(ValueError, match="Failed to extract public key from certificate"):
+        service.decode_jwt(token, public_key="FAKEPUBKEYDATA", certificate="")
+
+def test_decode_jwt_cache_is_keyed_by_key_material(monkeypatch):
+    """
+    Test decode_jwt does not reuse a cached result for different key material.
+    """
+    token = create_jwt({"user": "ron"})
+    calls = []
+    monkeypatch.setattr(service, "_verify_jwt_signature", lambda p, h, s, k: calls.append(k))
+    service.decode_jwt(token, public_key="KEYONE")
+    service.decode_jwt(token, public_key="KEYTWO")
+    assert len(calls) == 2
+
+def test_decode_jwt_failed_verification_not_cached(monkeypatch):
+    """
+    Test decode_jwt never caches a token whose signature failed verification.
+    """
+    token = create_jwt({"user": "ron"})
+    calls = []
+    def fail_verify(p, h, s, k):
+        calls.append(k)
+        raise Exception("Invalid signature")
+    monkeypatch.setattr(service, "_verify_jwt_signature", fail_verify)
+    assert service.decode_jwt(token, public_key="FAKEPUBKEYDATA").signature_verified is False
+    assert service.decode_jwt(token, public_key="FAKEPUBKEYDATA").signature_verified is False
+    assert len(calls) == 2
+
+def test_decode_jwt_expired_token_not_cached(monkeypatch):
+    """
+    Test decode_jwt does not cache a verified token whose 'exp' claim has passed.
+    """
+    token = create_jwt({"user": "ron", "exp": int(time.time()) - 60})
+    calls = []
+    monkeypatch.setattr(service, "_verify_jwt_signature", lambda p, h, s, k: calls.append(k))
+    service.decode_jwt(token, public_key="FAKEPUBKEYDATA")
+    service.decode_jwt(token, public_key="FAKEPUBKEYDATA")
+    assert len(calls) == 2
+
+def test_verify_jwt_signature_reuses_parsed_public_key():
+    """
+    Test _verify_jwt_signature parses a given PEM public key only once.
+    """
+    import json
+    from cryptography.hazmat.primitives.asymmetric import rsa, padding
+    from cryptography.hazmat.primitives import serialization, hashes
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pubkey = key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    header = service._b64url_encode(json.dumps({"alg": "RS256"}).encode())
+    payload = service._b64url_encode(json.dumps({"foo": "bar"}).encode())
+    sig = key.sign(f"{header}.{payload}".encode(), padding.PKCS1v15(), hashes.SHA256())
+    signature = service._b64url_encode(sig)
+    service._load_public_key.cache_clear()
+    service._verify_jwt_signature(f"{header}.{payload}", {"alg": "RS256"}, signature, pubkey)
+    service._SIGNATURE_CACHE.clear()
+    service._verify_jwt_signature(f"{header}.{payload}", {"alg": "RS256"}, signature, pubkey)
+    info = service._load_public_key.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+def test_verify_jwt_signature_hmac_valid_repeated():
+    """
+    Test _verify_jwt_signature accepts a valid HMAC signature on repeated calls with the same secret.
+    """
+    import json
+    import hashlib
+    import hmac
+    header = service._b64url_encode(json.dumps({"alg": "HS256"}).encode())
+    payload = service._b64url_encode(json.dumps({"foo": "bar"}).encode())
+    sig = hmac.new(b"secret", f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    signature = service._b64url_encode(sig)
+    service._verify_jwt_signature(f"{header}.{payload}", {"alg": "HS256"}, signature, "secret")
+    service._verify_jwt_signature(f"{header}.{payload}", {"alg": "HS256"}, signature, "secret")
+
+def test_decode_jwt_keeps_large_integer_claims_exact():
+    """
+    Test decode_jwt does not lose precision on integer claims beyond 64 bits.
+    """
+    token = create_jwt({"n": 123456789012345678901234567890, "iat": 1700000000})
+    decoded = service.decode_jwt(token)
+    assert decoded.data == {"n": 123456789012345678901234567890, "iat": 1700000000}
+
+def test_decode_jwt_accepts_json_only_the_stdlib_parses():
+    """
+    Test decode_jwt falls back to the stdlib for claims orjson rejects.
+    """
+    import math
+    token = create_jwt({"nan": float("nan"), "inf": float("inf"), "s": "\ud800"})
+    decoded = service.decode_jwt(token)
+    assert math.isnan(decoded.data["nan"])
+    assert decoded.data["inf"] == float("inf")
+    assert decoded.data["s"] == "\ud800"
+
+@pytest.mark.parametrize("header,payload", [([1, 2], {"sub": "x"}), ({"alg": "none"}, "hello")])
+def test_decode_jwt_rejects_non_object_segments(header, payload):
+    """
+    Test decode_jwt rejects a header or payload that is not a JSON object.
+    """
+    token = (
+        f"{service._b64url_encode(json.dumps(header).encode())}."
+        f"{service._b64url_encode(json.dumps(payload).encode())}."
+    )
+    with pytest.raises(ValueError, match="Failed to decode JWT"):
+        service.decode_jwt(token)
+
+def test_decode_jwt_too_many_parts():
+    """
+    Test decode_jwt rejects a token with more than 3 parts.
+    """
+    with pytest.raises(ValueError, match="Invalid JWT token format"):
+        service.decode_jwt("a.b.c.d")
+
+def test_verify_jwt_signature_cached_after_success():
+    """
+    Test _verify_jwt_signature skips the HMAC computation for an already verified signature.
+    """
+    import json
+    import hashlib
+    import hmac
+    header = service._b64url_encode(json.dumps({"alg": "HS256"}).encode())
+    payload = service._b64url_encode(json.dumps({"foo": "bar"}).encode())
+    sig = hmac.new(b"cached-secret", f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    signature = service._b64url_encode(sig)
+    service._verify_jwt_signature(f"{header}.{payload}", {"alg": "HS256"}, signature, "cached-secret")
+    before = service._primed_hmac.cache_info()
+    service._verify_jwt_signature(f"{header}.{payload}", {"alg": "HS256"}, signature, "cached-secret")
+    after = service._primed_hmac.cache_info()
+    assert (after.hits, after.misses) == (before.hits, before.misses)
+    with pytest.raises(ValueError, match="Invalid JWT signature"):
+        service._verify_jwt_signature(f"{header}.{payload}", {"alg": "HS256"}, signature, "other-secret")
+
+
+def test_b64url_decode_cached_for_repeated_segments():
+    """
+    Test repeated segments are decoded once and served from the cache.
+    """
+    segment = service._b64url_encode(b'{"user":"ron"}')
+    assert service._b64url_decode(segment) == b'{"user":"ron"}'
+    assert service._b64url_decode(segment) == b'{"user":"ron"}'
+    info = service._b64url_decode.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+
+
+def test_decode_jwt_certificate_parsed_once():
+    """
+    Test decode_jwt parses a repeated certificate once and verifies against it.
+    """
+    import datetime
+    from cryptography import x509
+    from cryptography.x509.oid import NameOID
+    from cryptography.hazmat.primitives.asymmetric import rsa, padding
+    from cryptography.hazmat.primitives import serialization, hashes
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "devkit")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    cert_pem = cert.public_bytes(serialization.Encoding.PEM).decode()
+    header = service._b64url_encode(json.dumps({"alg": "RS256"}).encode())
+    payload = service._b64url_encode(json.dumps({"foo": "bar"}).encode())
+    sig = key.sign(f"{header}.{payload}".encode(), padding.PKCS1v15(), hashes.SHA256())
+    token = f"{header}.{payload}.{service._b64url_encode(sig)}"
+    service._extract_public_key_from_certificate.cache_clear()
+    assert service.decode_jwt(token, certificate=cert_pem).signature_verified is True
+    service._DECODED_JWT_CACHE.clear()
+    assert service.decode_jwt(token, certificate=cert_pem).signature_verified is True
+    info = service._extract_public_key_from_certificate.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
+def test_b64url_encode_round_trip():
+    """
+    Test _b64url_encode strips padding and round-trips through _b64url_decode.
+    """
+    encoded = service._b64url_encode(b"ab")
+    assert encoded == "YWI"
+    assert service._b64url_decode(encoded) == b"ab"
+
+
+def test_verify_jwt_signature_ps256_valid():
+    """
+    Test _verify_jwt_signature accepts a valid PS256 signature using the shared padding table.
+    """
+    import json
+    from cryptography.hazmat.primitives.asymmetric import rsa, padding
+    from cryptography.hazmat.primitives import serialization, hashes
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pubkey = key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    header = service._b64url_encode(json.dumps({"alg": "PS256"}).encode())
+    payload = service._b64url_encode(json.dumps({"foo": "bar"}).encode())
+    sig = key.sign(
+        f"{header}.{payload}".encode(),
+        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
+        hashes.SHA256(),
+    )
+    service._verify_jwt_signature(f"{header}.{payload}", {"alg": "PS256"}, service._b64url_encode(sig), pubkey)
@@ -19,3 +19,7 @@ class TestGenerateGuidService:
         assert delimiter in guid
         assert "-" not in guid
         assert len(guid.split(delimiter)) == 5
+
+    def test_generate_guid_with_multichar_delimiter(self):
+        guid = generate_guid("::")
+        assert re.match(r"^[a-f0-9]{8}::[a-f0-9]{4}::[a-f0-9]{4}::[a-f0-9]{4}::[a-f0-9]{12}$", guid)
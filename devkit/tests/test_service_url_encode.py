@@ -18,5 +18,13 @@ class TestUrlEncode:
     def test_url_encode_unicode(self):
         assert url_encode("café") == "caf%C3%A9"
 
+    def test_url_encode_ascii_unreserved(self):
+        assert url_encode("AZaz09-._~") == "AZaz09-._~"
+
     def test_url_encode_empty(self):
         assert url_encode("") == ""
+
+    def test_url_encode_matches_quote(self):
+        from urllib.parse import quote
+        value = "".join(chr(c) for c in range(0x2000)) + "😀 ~-._"
+        assert url_encode(value) == quote(value, safe="")
@@ -5,14 +5,14 @@ Author: Ron Webb
 Since: 2.0.0
 """
 
-import os
 import tomllib
+from pathlib import Path
 from mcp_commons.config import McpConfig
 from mcp_server_winget.controller import ControllerRegistry
 
-with open(
-    os.path.join(os.path.dirname(os.path.dirname(__file__)), "pyproject.toml"), "rb"
-) as f:
+_PYPROJECT_PATH = Path(__file__).parents[1] / "pyproject.toml"
+
+with _PYPROJECT_PATH.open("rb") as f:
     pyproject = tomllib.load(f)
     app_name = pyproject["project"]["name"]
     version = pyproject["project"]["version"]
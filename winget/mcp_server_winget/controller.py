@@ -13,7 +13,7 @@ from collections.abc import Sequence
 from mcp_commons.util import setup_logger
 from mcp_commons.controller import BaseController, AbstractControllerRegistry
 from mcp_commons.exception import McpCommonsError
-from mcp.types import TextContent
+from mcp.types import TextContent, Tool
 from .service import (
     list_installed_packages,
     list_sources,
@@ -28,6 +28,33 @@ from .service import (
 
 logger = setup_logger(__name__)
 
+# Result messages keyed by (succeeded, version given).
+_INSTALL_TEMPLATES = {
+    (True, True): "{name} version {ver} installed",
+    (True, False): "{name} installed",
+    (False, True): "{name} version {ver} installation failed.",
+    (False, False): "{name} installation failed.",
+}
+_UPGRADE_TEMPLATES = {
+    (True, True): "{name} version {ver} upgraded successfully",
+    (True, False): "{name} upgraded successfully",
+    (False, True): "{name} version {ver} upgrade failed.",
+    (False, False): "{name} upgrade failed.",
+}
+# Result messages keyed by succeeded.
+_UNINSTALL_TEMPLATES = {
+    True: "{name} uninstalled",
+    False: "Failed to uninstall {name}.",
+}
+_ADD_SOURCE_TEMPLATES = {
+    True: "Source '{name}' added successfully",
+    False: "Failed to add source '{name}'",
+}
+_REMOVE_SOURCE_TEMPLATES = {
+    True: "Source '{name}' removed successfully",
+    False: "Failed to remove source '{name}'",
+}
+
 
 class ListInstalledPackagesController(BaseController):
     """Controller for listing installed Winget packages."""
@@ -122,9 +149,10 @@ class InstallPackageController(BaseController):
         logger.info("Installing package: %s", package_name)
         result = install_package(package_name, version)
         logger.debug("Installation result: %s", result)
-        version_text = f" version {version}" if version else ""
-        status = "installed" if result else "installation failed."
-        return [TextContent(type="text", text=f"{package_name}{version_text} {status}")]
+        text = _INSTALL_TEMPLATES[(bool(result), bool(version))].format(
+            name=package_name, ver=version
+        )
+        return [TextContent(type="text", text=text)]
 
 
 class UninstallPackageController(BaseController):
@@ -161,16 +189,8 @@ class UninstallPackageController(BaseController):
         logger.info("Uninstalling package: %s", package_name)
         result = uninstall_package(package_name)
         logger.debug("Uninstallation result: %s", result)
-        return [
-            TextContent(
-                type="text",
-                text=(
-                    f"{package_name} uninstalled"
-                    if result
-                    else f"Failed to uninstall {package_name}."
-                ),
-            )
-        ]
+        text = _UNINSTALL_TEMPLATES[bool(result)].format(name=package_name)
+        return [TextContent(type="text", text=text)]
 
 
 class ListAvailablePackagesController(BaseController):
@@ -253,13 +273,10 @@ class UpgradePackageController(BaseController):
         )
         result = upgrade_package(package_name, version)
         logger.debug("Upgrade result: %s", result)
-        version_text = f" version {version}" if version else ""
-        upgrade_text = "upgraded successfully" if result else "upgrade failed."
-        return [
-            TextContent(
-                type="text", text=f"{package_name}{version_text} {upgrade_text}"
-            )
-        ]
+        text = _UPGRADE_TEMPLATES[(bool(result), bool(version))].format(
+            name=package_name, ver=version
+        )
+        return [TextContent(type="text", text=text)]
 
 
 class AddSourceController(BaseController):
@@ -317,16 +334,8 @@ class AddSourceController(BaseController):
         result = add_source(source_name, source_url, source_type)
         logger.debug("Add source operation result: %s", result)
 
-        return [
-            TextContent(
-                type="text",
-                text=(
-                    f"Source '{source_name}' added successfully"
-                    if result
-                    else f"Failed to add source '{source_name}'"
-                ),
-            )
-        ]
+        text = _ADD_SOURCE_TEMPLATES[bool(result)].format(name=source_name)
+        return [TextContent(type="text", text=text)]
 
 
 class RemoveSourceController(BaseController):
@@ -365,9 +374,25 @@ class RemoveSourceController(BaseController):
         result = remove_source(source_name)
         logger.debug("Remove source operation result: %s", result)
 
-        success_msg = f"Source '{source_name}' removed successfully"
-        failure_msg = f"Failed to remove source '{source_name}'"
-        return [TextContent(type="text", text=success_msg if result else failure_msg)]
+        text = _REMOVE_SOURCE_TEMPLATES[bool(result)].format(name=source_name)
+        return [TextContent(type="text", text=text)]
+
+
+_CONTROLLERS: tuple[BaseController, ...] = (
+    ListInstalledPackagesController(),
+    ListSourcesController(),
+    InstallPackageController(),
+    UninstallPackageController(),
+    ListAvailablePackagesController(),
+    UpgradePackageController(),
+    AddSourceController(),
+    RemoveSourceController(),
+)
+_CONTROLLERS_BY_NAME: dict[str, BaseController] = {c.name: c for c in _CONTROLLERS}
+_TOOLS: tuple[Tool, ...] = tuple(c.tool() for c in _CONTROLLERS)
+_NOT_INSTALLED_MESSAGE = (
+    "Winget is not installed. Please run the 'install_winget' command first."
+)
 
 
 class ControllerRegistry(AbstractControllerRegistry):
@@ -377,16 +402,13 @@ class ControllerRegistry(AbstractControllerRegistry):
     """
 
     def get_registry(self) -> Sequence[BaseController]:
-        return (
-            ListInstalledPackagesController(),
-            ListSourcesController(),
-            InstallPackageController(),
-            UninstallPackageController(),
-            ListAvailablePackagesController(),
-            UpgradePackageController(),
-            AddSourceController(),
-            RemoveSourceController(),
-        )
+        return _CONTROLLERS
+
+    def get_tools(self) -> Sequence[Tool]:
+        return _TOOLS
+
+    def get_controller(self, name: str) -> BaseController | None:
+        return _CONTROLLERS_BY_NAME.get(name)
 
     def error_handler(
         self,
@@ -396,6 +418,5 @@ class ControllerRegistry(AbstractControllerRegistry):
         arguments: dict,
     ) -> list[TextContent]:
         if isinstance(exception, WingetNotInstalledError):
-            msg = "Winget is not installed. Please run the 'install_winget' command first."
-            return [TextContent(type="text", text=msg)]
+            return [TextContent(type="text", text=_NOT_INSTALLED_MESSAGE)]
         raise exception
@@ -9,13 +9,68 @@ Author: Ron Webb
 Since: 1.0.0
 """
 
+import base64
+import contextlib
+import functools
+import json
+import os
 import subprocess
 import shutil
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
 from mcp_commons.util import setup_logger
 from mcp_commons.exception import McpCommonsError
 
 logger = setup_logger(__name__)
 
+_RESULT_CACHE_TTL = 60.0
+_result_cache: dict[tuple[str, ...], tuple[float, list[str]]] = {}
+_result_cache_lock = threading.Lock()
+# Bumped by every cache clear, so a result read before a change is not cached after it.
+_result_cache_generation = 0
+# Keeps the installed packages for the next server process, which would otherwise
+# have to wait for a cold "winget list".
+_DISK_CACHE_FILE = "installed.json"
+
+# Keeps Windows from flashing a console window for each command started from a GUI host.
+_CREATION_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+# Tool calls run in worker threads. Changes are run one at a time, since Windows
+# Installer fails a second concurrent install and Winget queues them anyway.
+_change_lock = threading.Lock()
+
+_WINGET_RECHECK_INTERVAL = 30.0
+_winget_recheck_at = 0.0
+
+# The progressive and past tense wording of the commands that change a package.
+_PACKAGE_VERBS = {
+    "install": ("Installing", "installed"),
+    "uninstall": ("Uninstalling", "uninstalled"),
+    "upgrade": ("Upgrading", "upgraded"),
+}
+
+# Runs inside the elevated PowerShell. The command arrives as base64 encoded JSON,
+# so neither the Winget path nor any argument needs PowerShell quoting.
+_ELEVATED_SESSION_SCRIPT = (
+    "$session = [Text.Encoding]::UTF8.GetString("
+    "[Convert]::FromBase64String('{payload}')) | ConvertFrom-Json; "
+    "$arguments = @($session.args); & $session.winget @arguments; exit $LASTEXITCODE"
+)
+# Starts the elevated session and passes its exit code on. Stopping on errors makes
+# a declined UAC prompt, which Start-Process only reports, fail the launcher.
+_ELEVATED_LAUNCHER_SCRIPT = (
+    "$ErrorActionPreference = 'Stop'; "
+    "$p = Start-Process '{powershell}' -ArgumentList "
+    "'-NoProfile -NonInteractive -EncodedCommand {session_script}' "
+    "-Verb runas -Wait -PassThru; exit $p.ExitCode"
+)
+
+# Output lines starting with these are table borders or progress glyphs, not packages.
+# The progress bar blocks read as "â" when decoded with a legacy code page.
+_SKIPPED_FIRST_CHARS = frozenset("|/â\\ █▒")
+
 
 class WingetNotInstalledError(McpCommonsError):
     """Exception raised when Winget is not installed or not available in PATH."""
@@ -25,22 +80,270 @@ class WingetCommandError(McpCommonsError):
     """Exception raised when a Winget command fails."""
 
 
-def _validate_winget_command():
+@contextlib.contextmanager
+def _translate_errors(action: str) -> Iterator[None]:
+    """Report any unexpected error of a Winget operation as a WingetCommandError.
+
+    Args:
+        action: What the operation does, e.g. "list Winget sources".
+
+    Raises:
+        WingetCommandError: If the operation fails.
+        WingetNotInstalledError: If Winget is not installed.
+    """
+    try:
+        yield
+    except WingetNotInstalledError:
+        raise
+    except Exception as e:
+        logger.error("Failed to %s: %s", action, str(e))
+        raise WingetCommandError(f"Failed to {action}: {str(e)}") from e
+
+
+def _get_cached_result(key: tuple[str, ...]) -> list[str] | None:
+    """Get the parsed result of a read-only Winget command if it has not expired.
+
+    Args:
+        key: The command arguments the result was produced for.
+
+    Returns:
+        list[str] | None: A copy of the cached result, or None if there is none.
+    """
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del _result_cache[key]
+            return None
+        return list(result)
+
+
+def _get_cache_generation() -> int:
+    """Get the current cache generation, to be read before running a command.
+
+    Returns:
+        int: The number of cache clears so far.
+    """
+    with _result_cache_lock:
+        return _result_cache_generation
+
+
+def _put_cached_result(
+    key: tuple[str, ...], result: list[str], generation: int
+) -> None:
+    """Cache the parsed result of a read-only Winget command.
+
+    Expired entries are dropped on the way, so results of one-off searches do not pile up.
+
+    Args:
+        key: The command arguments the result was produced for.
+        result: The parsed result.
+        generation: The cache generation read before the command ran. The result is
+            not cached if the cache was cleared since, as it may predate a change.
+    """
+    with _result_cache_lock:
+        if generation != _result_cache_generation:
+            return
+        now = time.monotonic()
+        for expired in [k for k, (exp, _) in _result_cache.items() if exp <= now]:
+            del _result_cache[expired]
+        _result_cache[key] = (now + _RESULT_CACHE_TTL, list(result))
+
+
+def _disk_cache_path() -> Path | None:
+    """Get the file that keeps results across server processes.
+
+    Returns:
+        Path | None: The cache file under LOCALAPPDATA, or None if it is not set.
+    """
+    local_app_data = os.environ.get("LOCALAPPDATA")
+    if not local_app_data:
+        return None
+    return Path(local_app_data) / "mcp_server_winget" / _DISK_CACHE_FILE
+
+
+def _read_disk_cache(path: Path) -> dict:
+    """Read the entries of the cache file.
+
+    Args:
+        path: The cache file.
+
+    Returns:
+        dict: The entries by command, or an empty dict if the file is missing or unreadable.
+    """
+    try:
+        entries = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def _get_disk_cached_result(key: tuple[str, ...]) -> list[str] | None:
+    """Get a result cached by this or an earlier server process if it has not expired.
+
+    Args:
+        key: The command arguments the result was produced for.
+
+    Returns:
+        list[str] | None: The cached result, or None if there is none.
+    """
+    path = _disk_cache_path()
+    if path is None:
+        return None
+    entry = _read_disk_cache(path).get(" ".join(key))
+    try:
+        if entry["expires_at"] > time.time():
+            return [str(line) for line in entry["data"]]
+    except (KeyError, TypeError):
+        pass
+    return None
+
+
+def _put_disk_cached_result(
+    key: tuple[str, ...], result: list[str], generation: int
+) -> None:
+    """Cache a result for later server processes.
+
+    The file is replaced atomically, so a concurrent reader never sees a partial write.
+
+    Args:
+        key: The command arguments the result was produced for.
+        result: The parsed result.
+        generation: The cache generation read before the command ran.
+    """
+    path = _disk_cache_path()
+    if path is None:
+        return
+    with _result_cache_lock:
+        # Checked under the lock, so a concurrent clear cannot remove the file in between.
+        if generation == _result_cache_generation:
+            _write_disk_cache(path, key, result)
+
+
+def _write_disk_cache(path: Path, key: tuple[str, ...], result: list[str]) -> None:
+    """Add a result to the cache file.
+
+    Args:
+        path: The cache file.
+        key: The command arguments the result was produced for.
+        result: The parsed result.
+    """
+    entries = _read_disk_cache(path)
+    entries[" ".join(key)] = {
+        "expires_at": time.time() + _RESULT_CACHE_TTL,
+        "data": result,
+    }
+    # Tool calls run in worker threads, so each writer needs its own temp file.
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path.write_text(json.dumps(entries), encoding="utf-8")
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.debug("Failed to write the result cache file: %s", e)
+
+
+def _clear_result_cache() -> None:
+    """Drop all cached results, e.g. after a command that changes packages or sources."""
+    global _result_cache_generation  # pylint: disable=global-statement
+    path = _disk_cache_path()
+    with _result_cache_lock:
+        _result_cache_generation += 1
+        _result_cache.clear()
+        if path is not None:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.debug("Failed to remove the result cache file: %s", e)
+
+
+@functools.lru_cache(maxsize=1)
+def _winget_path() -> str | None:
+    """Resolve the Winget executable on PATH once per process.
+
+    Returns:
+        str | None: The full path of the Winget executable, or None if it is not found.
+    """
+    return shutil.which("winget")
+
+
+def _validate_winget_command() -> str:
     """Validates if Winget is available in the system PATH.
 
+    A missing Winget is remembered for a short while, so calls in an environment
+    without Winget fail fast instead of searching PATH every time.
+
+    Returns:
+        str: The full path of the Winget executable.
+
     Raises:
         WingetNotInstalledError: If Winget is not installed or not in PATH.
     """
-    if not shutil.which("winget"):
-        logger.error("Winget command is not available in PATH")
+    global _winget_recheck_at  # pylint: disable=global-statement
+    winget = None
+    if time.monotonic() >= _winget_recheck_at:
+        winget = _winget_path()
+        if not winget:
+            # Look again after the interval, so a later installation of Winget is picked up.
+            _winget_path.cache_clear()
+            _winget_recheck_at = time.monotonic() + _WINGET_RECHECK_INTERVAL
+            logger.error("Winget command is not available in PATH")
+    if not winget:
         raise WingetNotInstalledError(
             "Winget is not installed or not available in PATH"
         )
+    return winget
+
+
+def _run_winget_command_lines(args: list[str]) -> Iterator[str]:
+    """Run a Winget command and yield its output lines as they are produced.
+
+    The output is streamed from the process, so callers can parse it while Winget
+    is still running instead of waiting for the whole output to be buffered.
+
+    Args:
+        args: List of command arguments to pass to Winget.
+
+    Yields:
+        str: Each output line, without its line terminator.
+
+    Raises:
+        WingetCommandError: If the command fails or no arguments are provided.
+        WingetNotInstalledError: If Winget is not installed.
+    """
+    winget = _validate_winget_command()
+
+    if not args:
+        logger.error("No command arguments provided")
+        raise WingetCommandError("No command arguments provided")
+
+    logger.debug("Running Winget command with args: %s", args)
+    with subprocess.Popen(
+        [winget] + args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        creationflags=_CREATION_FLAGS,
+    ) as process:
+        for line in process.stdout:
+            yield line.rstrip("\n")
+    if process.returncode:
+        error = subprocess.CalledProcessError(process.returncode, process.args)
+        logger.error("Failed to run Winget command: %s", error)
+        raise WingetCommandError(f"Failed to run Winget command: {error}") from error
+    logger.debug("Command completed successfully")
 
 
 def _run_winget_command(args: list[str]) -> str:
     """Run a Winget command and return its output.
 
+    Unlike the streaming read path, the error output is captured, so a failing
+    command that changes packages reports why it failed.
+
     Args:
         args: List of command arguments to pass to Winget.
 
@@ -51,7 +354,7 @@ def _run_winget_command(args: list[str]) -> str:
         WingetCommandError: If the command fails or no arguments are provided.
         WingetNotInstalledError: If Winget is not installed.
     """
-    _validate_winget_command()
+    winget = _validate_winget_command()
 
     if not args:
         logger.error("No command arguments provided")
@@ -60,19 +363,43 @@ def _run_winget_command(args: list[str]) -> str:
     try:
         logger.debug("Running Winget command with args: %s", args)
         process = subprocess.run(
-            ["winget"] + args,
+            [winget] + args,
             capture_output=True,
             text=True,
             encoding="utf-8",
             errors="replace",
             check=True,
+            creationflags=_CREATION_FLAGS,
         )
-        output = process.stdout.strip() if process.stdout else ""
-        logger.debug("Command completed successfully. Output: %s", output)
-        return output
+        logger.debug("Command completed successfully")
+        return process.stdout.strip()
     except subprocess.CalledProcessError as e:
-        logger.error("Failed to run Winget command: %s", e)
-        raise WingetCommandError(f"Failed to run Winget command: {e}") from e
+        # Winget reports most failures on stdout rather than stderr.
+        error_msg = (e.stderr or "").strip() or (e.stdout or "").strip() or str(e)
+        logger.error("Failed to run Winget command: %s", error_msg)
+        raise WingetCommandError(f"Failed to run Winget command: {error_msg}") from e
+
+
+@functools.lru_cache(maxsize=1)
+def _powershell_path() -> str:
+    """Resolve the PowerShell to run elevated commands with once per process.
+
+    Returns:
+        str: PowerShell 7 if it is installed, since it starts faster, else Windows PowerShell.
+    """
+    return shutil.which("pwsh") or "powershell.exe"
+
+
+def _encode_ps_script(script: str) -> str:
+    """Encode a PowerShell script for -EncodedCommand.
+
+    Args:
+        script: The PowerShell script.
+
+    Returns:
+        str: The base64 encoded UTF-16LE script.
+    """
+    return base64.b64encode(script.encode("utf-16le")).decode("ascii")
 
 
 def _run_elevated_winget_command(args: list[str]) -> str:
@@ -88,7 +415,7 @@ def _run_elevated_winget_command(args: list[str]) -> str:
         WingetCommandError: If the command fails or no arguments are provided.
         WingetNotInstalledError: If Winget is not installed.
     """
-    _validate_winget_command()
+    winget = _validate_winget_command()
 
     if not args:
         logger.error("No command arguments provided")
@@ -96,26 +423,35 @@ def _run_elevated_winget_command(args: list[str]) -> str:
 
     try:
         logger.debug("Running elevated Winget command with args: %s", args)
-        # Escape arguments that contain spaces
-        winget_args = " ".join(f'"""{arg}"""' if " " in arg else arg for arg in args)
-
-        ps_script = (
-            f'Start-Process winget -ArgumentList "{winget_args}" -Verb runas -Wait'
+        powershell = _powershell_path()
+        payload = base64.b64encode(
+            json.dumps({"winget": winget, "args": args}).encode("utf-8")
+        ).decode("ascii")
+        session_script = _encode_ps_script(
+            _ELEVATED_SESSION_SCRIPT.format(payload=payload)
+        )
+        launcher_script = _encode_ps_script(
+            _ELEVATED_LAUNCHER_SCRIPT.format(
+                powershell=powershell.replace("'", "''"),
+                session_script=session_script,
+            )
         )
 
-        process = subprocess.run(
-            ["powershell.exe", "-NoProfile", "-NonInteractive", "-Command", ps_script],
+        subprocess.run(
+            [
+                powershell,
+                "-NoProfile",
+                "-NonInteractive",
+                "-EncodedCommand",
+                launcher_script,
+            ],
             capture_output=True,
             text=True,
             check=True,
+            creationflags=_CREATION_FLAGS,
         )
-
-        if process.returncode == 0:
-            logger.debug("Elevated command completed successfully")
-            return "Command completed successfully"
-
-        error = process.stderr.strip() or "Unknown error occurred"
-        raise WingetCommandError(error)
+        logger.debug("Elevated command completed successfully")
+        return "Command completed successfully"
 
     except subprocess.CalledProcessError as e:
         error_msg = e.stderr.strip() if e.stderr else str(e)
@@ -125,6 +461,30 @@ def _run_elevated_winget_command(args: list[str]) -> str:
         ) from e
 
 
+def _package_lines(
+    lines: Iterable[str], excluded_prefix: str | None = None
+) -> list[str]:
+    """Keep the stripped, non-empty output lines that describe packages.
+
+    Args:
+        lines: The raw output lines.
+        excluded_prefix: An additional line prefix to skip, e.g. a "no match" message.
+
+    Returns:
+        list[str]: The package lines.
+    """
+    packages = []
+    for line in lines:
+        line = line.strip()
+        if (
+            line
+            and line[0] not in _SKIPPED_FIRST_CHARS
+            and not (excluded_prefix and line.startswith(excluded_prefix))
+        ):
+            packages.append(line)
+    return packages
+
+
 def list_installed_packages() -> list[str]:
     """Get a list of installed Winget packages.
 
@@ -135,27 +495,26 @@ def list_installed_packages() -> list[str]:
         WingetCommandError: If there is an error listing packages.
         WingetNotInstalledError: If Winget is not installed.
     """
-    try:
+    args = ["list", "--disable-interactivity"]
+    cache_key = tuple(args)
+    with _translate_errors("list Winget packages"):
         logger.info("Retrieving list of installed packages")
-        output = _run_winget_command(["list"])
-        if not output:
-            logger.debug("No packages found")
-            return []
-
-        packages = output.split("\n")
-        formatted_packages = []
-        for pkg in packages:
-            pkg = pkg.strip()
-            if pkg and not pkg.startswith(("|", "/", "â", "\\", " ")):
-                formatted_packages.append(pkg)
+        generation = _get_cache_generation()
+        cached = _get_cached_result(cache_key)
+        if cached is not None:
+            logger.debug("Using cached list of %d packages", len(cached))
+            return cached
+        cached = _get_disk_cached_result(cache_key)
+        if cached is not None:
+            logger.debug("Using list of %d packages cached on disk", len(cached))
+            _put_cached_result(cache_key, cached, generation)
+            return cached
+        formatted_packages = _package_lines(_run_winget_command_lines(args))
 
         logger.debug("Found %d packages", len(formatted_packages))
+        _put_cached_result(cache_key, formatted_packages, generation)
+        _put_disk_cached_result(cache_key, formatted_packages, generation)
         return formatted_packages
-    except WingetNotInstalledError:
-        raise
-    except Exception as e:
-        logger.error("Failed to list Winget packages: %s", str(e))
-        raise WingetCommandError(f"Failed to list Winget packages: {str(e)}") from e
 
 
 def list_sources() -> list[str]:
@@ -168,62 +527,77 @@ def list_sources() -> list[str]:
         WingetCommandError: If there is an error listing sources.
         WingetNotInstalledError: If Winget is not installed.
     """
-    try:
+    with _translate_errors("list Winget sources"):
         logger.info("Retrieving list of Winget sources")
-        output = _run_winget_command(["source", "list"])
-        if not output:
-            logger.debug("No sources found")
-            return []
-
-        sources = output.split("\n")
-        formatted_sources = [source.strip() for source in sources if source.strip()]
+        generation = _get_cache_generation()
+        cached = _get_cached_result(("source", "list"))
+        if cached is not None:
+            logger.debug("Using cached list of %d sources", len(cached))
+            return cached
+        lines = _run_winget_command_lines(["source", "list"])
+        formatted_sources = [
+            source for source in (line.strip() for line in lines) if source
+        ]
 
         logger.debug("Found %d sources", len(formatted_sources))
+        _put_cached_result(("source", "list"), formatted_sources, generation)
         return formatted_sources
-    except WingetNotInstalledError:
-        raise
-    except Exception as e:
-        logger.error("Failed to list Winget sources: %s", str(e))
-        raise WingetCommandError(f"Failed to list Winget sources: {str(e)}") from e
 
 
-def install_package(package_name: str, version: str | None = None) -> bool:
-    """Install a Winget package.
+def _run_package_command(
+    verb: str, package_name: str, version: str | None = None
+) -> bool:
+    """Run a Winget command that changes a single package.
 
     Args:
-        package_name: Name of the package to install.
-        version: Optional specific version to install.
+        verb: The Winget command, i.e. one of the keys of _PACKAGE_VERBS.
+        package_name: Name of the package.
+        version: Optional specific version of the package.
 
     Returns:
-        bool: True if installation was successful, False otherwise.
+        bool: True if the command was successful.
 
     Raises:
-        WingetCommandError: If there is an error during installation or package name is empty.
+        WingetCommandError: If the command fails or package name is empty.
         WingetNotInstalledError: If Winget is not installed.
     """
     if not package_name or not package_name.strip():
         logger.error("Package name cannot be empty")
         raise WingetCommandError("Package name cannot be empty")
 
-    try:
+    progressive, past = _PACKAGE_VERBS[verb]
+    with _translate_errors(f"{verb} package {package_name}"):
         logger.info(
-            "Installing package: %s%s",
+            "%s package: %s%s",
+            progressive,
             package_name,
             f" version {version}" if version else "",
         )
-        args = ["install", package_name]
+        args = [verb, package_name]
         if version:
             args.extend(["--version", version])
-        _run_winget_command(args)
-        logger.info("Package %s installed successfully", package_name)
+        with _change_lock:
+            _run_winget_command(args)
+        _clear_result_cache()
+        logger.info("Package %s %s successfully", package_name, past)
         return True
-    except WingetNotInstalledError:
-        raise
-    except Exception as e:
-        logger.error("Failed to install package %s: %s", package_name, str(e))
-        raise WingetCommandError(
-            f"Failed to install package {package_name}: {str(e)}"
-        ) from e
+
+
+def install_package(package_name: str, version: str | None = None) -> bool:
+    """Install a Winget package.
+
+    Args:
+        package_name: Name of the package to install.
+        version: Optional specific version to install.
+
+    Returns:
+        bool: True if installation was successful, False otherwise.
+
+    Raises:
+        WingetCommandError: If there is an error during installation or package name is empty.
+        WingetNotInstalledError: If Winget is not installed.
+    """
+    return _run_package_command("install", package_name, version)
 
 
 def uninstall_package(package_name: str) -> bool:
@@ -239,22 +613,7 @@ def uninstall_package(package_name: str) -> bool:
         WingetCommandError: If there is an error during uninstallation or package name is empty.
         WingetNotInstalledError: If Winget is not installed.
     """
-    if not package_name or not package_name.strip():
-        logger.error("Package name cannot be empty")
-        raise WingetCommandError("Package name cannot be empty")
-
-    try:
-        logger.info("Uninstalling package: %s", package_name)
-        _run_winget_command(["uninstall", package_name])
-        logger.info("Package %s uninstalled successfully", package_name)
-        return True
-    except WingetNotInstalledError:
-        raise
-    except Exception as e:
-        logger.error("Failed to uninstall package %s: %s", package_name, str(e))
-        raise WingetCommandError(
-            f"Failed to uninstall package {package_name}: {str(e)}"
-        ) from e
+    return _run_package_command("uninstall", package_name)
 
 
 def upgrade_package(package_name: str, version: str | None = None) -> bool:
@@ -271,29 +630,7 @@ def upgrade_package(package_name: str, version: str | None = None) -> bool:
         WingetCommandError: If there is an error during upgrade or package name is empty.
         WingetNotInstalledError: If Winget is not installed.
     """
-    if not package_name or not package_name.strip():
-        logger.error("Package name cannot be empty")
-        raise WingetCommandError("Package name cannot be empty")
-
-    try:
-        logger.info(
-            "Upgrading package: %s%s",
-            package_name,
-            f" to version {version}" if version else "",
-        )
-        args = ["upgrade", package_name]
-        if version:
-            args.extend(["--version", version])
-        _run_winget_command(args)
-        logger.info("Package %s upgraded successfully", package_name)
-        return True
-    except WingetNotInstalledError:
-        raise
-    except Exception as e:
-        logger.error("Failed to upgrade package %s: %s", package_name, str(e))
-        raise WingetCommandError(
-            f"Failed to upgrade package {package_name}: {str(e)}"
-        ) from e
+    return _run_package_command("upgrade", package_name, version)
 
 
 def list_available_packages(search_term: str = "") -> list[str]:
@@ -309,42 +646,30 @@ def list_available_packages(search_term: str = "") -> list[str]:
         WingetCommandError: If there is an error listing packages.
         WingetNotInstalledError: If Winget is not installed.
     """
-    try:
+    with _translate_errors("list available Winget packages"):
         logger.info("Searching for available packages with term: %s", search_term)
         args = ["search"]
         if search_term:
             args.append(search_term)
 
-        output = _run_winget_command(args)
-        if not output:
-            logger.debug("No packages found")
-            return []
-
-        packages = []
-        for line in output.split("\n"):
-            line = line.strip()
-            if (
-                line
-                and not line.startswith(("|", "/", "â", "\\", " "))
-                and not line.startswith("No package found matching")
-            ):
-                packages.append(line)
+        generation = _get_cache_generation()
+        cached = _get_cached_result(tuple(args))
+        if cached is not None:
+            logger.debug("Using cached list of %d available packages", len(cached))
+            return cached
+        packages = _package_lines(
+            _run_winget_command_lines(args), "No package found matching"
+        )
 
         logger.debug("Found %d available packages", len(packages))
+        _put_cached_result(tuple(args), packages, generation)
         return packages
-    except WingetNotInstalledError:
-        raise
-    except Exception as e:
-        logger.error("Failed to list available Winget packages: %s", str(e))
-        raise WingetCommandError(
-            f"Failed to list available Winget packages: {str(e)}"
-        ) from e
 
 
-def add_source(
-    source_name: str, source_url: str, source_type: str | None = None
-) -> bool:
-    """Add a new Winget package source.
+def _add_source_args(
+    source_name: str, source_url: str, source_type: str | None
+) -> list[str]:
+    """Build the Winget arguments that add a package source.
 
     Args:
         source_name: Name of the source to add.
@@ -352,11 +677,10 @@ def add_source(
         source_type: Type of the package source (defaults to 'Microsoft.Rest').
 
     Returns:
-        bool: True if source was added successfully, False otherwise.
+        list[str]: The Winget command arguments.
 
     Raises:
-        WingetCommandError: If there is an error adding the source or required parameters are missing.
-        WingetNotInstalledError: If Winget is not installed.
+        WingetCommandError: If the source name or URL is empty.
     """
     if not source_name or not source_name.strip():
         logger.error("Source name cannot be empty")
@@ -366,7 +690,57 @@ def add_source(
         logger.error("Source URL cannot be empty")
         raise WingetCommandError("Source URL cannot be empty")
 
-    try:
+    return [
+        "source",
+        "add",
+        "--name",
+        source_name,
+        "--arg",
+        source_url,
+        "--type",
+        source_type if source_type is not None else "Microsoft.Rest",
+    ]
+
+
+def _remove_source_args(source_name: str) -> list[str]:
+    """Build the Winget arguments that remove a package source.
+
+    Args:
+        source_name: Name of the source to remove.
+
+    Returns:
+        list[str]: The Winget command arguments.
+
+    Raises:
+        WingetCommandError: If the source name is empty.
+    """
+    if not source_name or not source_name.strip():
+        logger.error("Source name cannot be empty")
+        raise WingetCommandError("Source name cannot be empty")
+
+    return ["source", "remove", "--name", source_name]
+
+
+def add_source(
+    source_name: str, source_url: str, source_type: str | None = None
+) -> bool:
+    """Add a new Winget package source.
+
+    Args:
+        source_name: Name of the source to add.
+        source_url: URL of the package source.
+        source_type: Type of the package source (defaults to 'Microsoft.Rest').
+
+    Returns:
+        bool: True if source was added successfully, False otherwise.
+
+    Raises:
+        WingetCommandError: If there is an error adding the source or required parameters are missing.
+        WingetNotInstalledError: If Winget is not installed.
+    """
+    args = _add_source_args(source_name, source_url, source_type)
+
+    with _translate_errors(f"add source {source_name}"):
         logger.info(
             "Adding source: %s with URL: %s and type: %s",
             source_name,
@@ -374,28 +748,11 @@ def add_source(
             source_type,
         )
 
-        actual_source_type = (
-            source_type if source_type is not None else "Microsoft.Rest"
-        )
-        args = [
-            "source",
-            "add",
-            "--name",
-            source_name,
-            "--arg",
-            source_url,
-            "--type",
-            actual_source_type,
-        ]
-
-        _run_elevated_winget_command(args)
+        with _change_lock:
+            _run_elevated_winget_command(args)
+        _clear_result_cache()
         logger.info("Source %s added successfully", source_name)
         return True
-    except WingetNotInstalledError:
-        raise
-    except Exception as e:
-        logger.error("Failed to add source %s: %s", source_name, str(e))
-        raise WingetCommandError(f"Failed to add source {source_name}: {str(e)}") from e
 
 
 def remove_source(source_name: str) -> bool:
@@ -411,19 +768,12 @@ def remove_source(source_name: str) -> bool:
         WingetCommandError: If there is an error removing the source or source name is empty.
         WingetNotInstalledError: If Winget is not installed.
     """
-    if not source_name or not source_name.strip():
-        logger.error("Source name cannot be empty")
-        raise WingetCommandError("Source name cannot be empty")
+    args = _remove_source_args(source_name)
 
-    try:
+    with _translate_errors(f"remove source {source_name}"):
         logger.info("Removing source: %s", source_name)
-        _run_elevated_winget_command(["source", "remove", "--name", source_name])
+        with _change_lock:
+            _run_elevated_winget_command(args)
+        _clear_result_cache()
         logger.info("Source %s removed successfully", source_name)
         return True
-    except WingetNotInstalledError:
-        raise
-    except Exception as e:
-        logger.error("Failed to remove source %s: %s", source_name, str(e))
-        raise WingetCommandError(
-            f"Failed to remove source {source_name}: {str(e)}"
-        ) from e
@@ -90,6 +90,15 @@ class TestControllers:
         assert isinstance(result[0], TextContent)
         assert "installed" in result[0].text.lower()
 
+    @patch("mcp_server_winget.controller.install_package")
+    def test_install_package_controller_failed_with_version(self, mock_install):
+        mock_install.return_value = False
+        controller = InstallPackageController()
+        result = controller.execute(
+            "wg_install_package", {"package_name": "test-pkg", "version": "1.0"}
+        )
+        assert result[0].text == "test-pkg version 1.0 installation failed."
+
     def test_install_package_controller_missing_name(self):
         controller = InstallPackageController()
         with pytest.raises(ValueError, match="Package name is required"):
@@ -129,6 +138,13 @@ class TestControllers:
         assert isinstance(result[0], TextContent)
         assert "uninstalled" in result[0].text.lower()
 
+    @patch("mcp_server_winget.controller.uninstall_package")
+    def test_uninstall_package_controller_failure(self, mock_uninstall):
+        mock_uninstall.return_value = False
+        controller = UninstallPackageController()
+        result = controller.execute("wg_uninstall_package", {"package_name": "test-pkg"})
+        assert result[0].text == "Failed to uninstall test-pkg."
+
     def test_uninstall_package_controller_missing_name(self):
         controller = UninstallPackageController()
         with pytest.raises(ValueError, match="Package name is required"):
@@ -161,6 +177,13 @@ class TestControllers:
         assert isinstance(result[0], TextContent)
         assert "upgraded successfully" in result[0].text.lower()
 
+    @patch("mcp_server_winget.controller.upgrade_package")
+    def test_upgrade_package_controller_failed(self, mock_upgrade):
+        mock_upgrade.return_value = False
+        controller = UpgradePackageController()
+        result = controller.execute("wg_upgrade_package", {"package_name": "test-pkg"})
+        assert result[0].text == "test-pkg upgrade failed."
+
     def test_upgrade_package_controller_missing_name(self):
         controller = UpgradePackageController()
         with pytest.raises(ValueError, match="Package name is required"):
@@ -211,6 +234,13 @@ class TestControllers:
         assert isinstance(result[0], TextContent)
         assert "removed successfully" in result[0].text.lower()
 
+    @patch("mcp_server_winget.controller.remove_source")
+    def test_remove_source_controller_failure(self, mock_remove):
+        mock_remove.return_value = False
+        controller = RemoveSourceController()
+        result = controller.execute("wg_remove_source", {"source_name": "test-source"})
+        assert result[0].text == "Failed to remove source 'test-source'"
+
     def test_remove_source_controller_missing_name(self):
         controller = RemoveSourceController()
         with pytest.raises(ValueError, match="Source name is required"):
@@ -222,6 +252,21 @@ class TestControllers:
         assert len(registry) > 0
         assert all(isinstance(c, BaseController) for c in registry)
 
+    def test_get_controller_registry_is_shared(self):
+        assert ControllerRegistry().get_registry() is ControllerRegistry().get_registry()
+
+    def test_get_tools(self):
+        registry = ControllerRegistry()
+        tools = registry.get_tools()
+        assert tools is ControllerRegistry().get_tools()
+        assert [t.name for t in tools] == [c.name for c in registry.get_registry()]
+
+    def test_get_controller(self):
+        registry = ControllerRegistry()
+        for controller in registry.get_registry():
+            assert registry.get_controller(controller.name) is controller
+        assert registry.get_controller("unknown_tool") is None
+
     def test_execute_tool_unknown(self):
         with pytest.raises(Exception, match="Unknown tool"):
             execute_tool("unknown_tool", {})
@@ -245,3 +290,11 @@ class TestControllers:
         assert len(result) == 1
         assert isinstance(result[0], TextContent)
         assert "not installed" in result[0].text.lower()
+
+    @patch("mcp_server_winget.controller.list_installed_packages")
+    def test_execute_tool_winget_not_installed_builds_fresh_content(self, mock_list):
+        mock_list.side_effect = WingetNotInstalledError("not installed")
+        first = execute_tool("wg_list_installed_packages", {})
+        second = execute_tool("wg_list_installed_packages", {})
+        assert first == second
+        assert first[0] is not second[0]
@@ -0,0 +1,20 @@
+import pytest
+import mcp_server_winget
+from mcp_server_winget.controller import ControllerRegistry
+
+
+class TestWingetInit:
+    def test_version_matches_pyproject(self):
+        assert mcp_server_winget.app_name == "mcp-server-winget"
+        assert mcp_server_winget.version == "2.1.0"
+
+    def test_mcp_config_is_created_once(self):
+        config = mcp_server_winget.mcp_config
+        assert config is mcp_server_winget.mcp_config
+        assert config.server_name == "Winget MCP Server"
+        assert config.server_version == mcp_server_winget.version
+        assert isinstance(config.controller_registry, ControllerRegistry)
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            mcp_server_winget.unknown_attribute
@@ -1,11 +1,16 @@
+import base64
+import json
 import pytest
 import subprocess
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from mcp_server_winget import service
 from mcp_server_winget.service import (
     WingetNotInstalledError,
     WingetCommandError,
     _validate_winget_command,
     _run_winget_command,
+    _run_winget_command_lines,
     _run_elevated_winget_command,
     list_installed_packages,
     list_sources,
@@ -17,175 +22,342 @@ from mcp_server_winget.service import (
     remove_source
 )
 
+@pytest.fixture(autouse=True)
+def clear_result_cache(monkeypatch):
+    """Clear cached command results and the Winget path so they do not leak between tests."""
+    monkeypatch.delenv("LOCALAPPDATA", raising=False)
+    service._clear_result_cache()
+    service._winget_path.cache_clear()
+    service._powershell_path.cache_clear()
+    service._winget_recheck_at = 0.0
+    yield
+    service._clear_result_cache()
+    service._winget_path.cache_clear()
+    service._powershell_path.cache_clear()
+    service._winget_recheck_at = 0.0
+
+
+@pytest.fixture(autouse=True)
+def mocks(monkeypatch):
+    """Replace the process launches and Winget runners of the service for every test.
+
+    The runners under test are called through the names imported above, which keep
+    pointing at the real functions.
+    """
+    fakes = SimpleNamespace(
+        which=MagicMock(return_value="winget"),
+        run=MagicMock(),
+        popen=MagicMock(),
+        run_winget=MagicMock(return_value=""),
+        run_lines=MagicMock(return_value=[]),
+        run_elevated=MagicMock(return_value="Command completed successfully"),
+    )
+    fakes.popen.return_value.__enter__.return_value = fakes.popen.return_value
+    monkeypatch.setattr("mcp_server_winget.service.shutil.which", fakes.which)
+    monkeypatch.setattr("mcp_server_winget.service.subprocess.run", fakes.run)
+    monkeypatch.setattr("mcp_server_winget.service.subprocess.Popen", fakes.popen)
+    monkeypatch.setattr("mcp_server_winget.service._run_winget_command", fakes.run_winget)
+    monkeypatch.setattr("mcp_server_winget.service._run_winget_command_lines", fakes.run_lines)
+    monkeypatch.setattr("mcp_server_winget.service._run_elevated_winget_command", fakes.run_elevated)
+    return fakes
+
+
 class TestWingetService:
-    @patch("mcp_server_winget.service.shutil.which")
-    def test_validate_winget_command_success(self, mock_which):
-        mock_which.return_value = "/path/to/winget"
+    def test_validate_winget_command_success(self, mocks):
+        mocks.which.return_value = "/path/to/winget"
         _validate_winget_command()  # Should not raise
 
-    @patch("mcp_server_winget.service.shutil.which")
-    def test_validate_winget_command_not_found(self, mock_which):
-        mock_which.return_value = None
+    def test_validate_winget_command_cached(self, mocks):
+        mocks.which.return_value = "/path/to/winget"
+        assert _validate_winget_command() == "/path/to/winget"
+        assert _validate_winget_command() == "/path/to/winget"
+        mocks.which.assert_called_once_with("winget")
+
+    def test_validate_winget_command_miss_rechecked_after_interval(self, mocks, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("mcp_server_winget.service.time.monotonic", lambda: now[0])
+        mocks.which.return_value = None
         with pytest.raises(WingetNotInstalledError):
             _validate_winget_command()
+        mocks.which.return_value = "/path/to/winget"
+        with pytest.raises(WingetNotInstalledError):
+            _validate_winget_command()
+        mocks.which.assert_called_once_with("winget")
+        now[0] += service._WINGET_RECHECK_INTERVAL
+        assert _validate_winget_command() == "/path/to/winget"
+
+    def test_validate_winget_command_not_found(self, mocks):
+        mocks.which.return_value = None
+        with pytest.raises(WingetNotInstalledError):
+            _validate_winget_command()
+
+    def test_run_winget_command_success(self, mocks):
+        mocks.run.return_value = SimpleNamespace(stdout="command output\n", returncode=0, stderr="")
 
-    @patch("mcp_server_winget.service.subprocess.run")
-    def test_run_winget_command_success(self, mock_run):
-        mock_process = MagicMock()
-        mock_process.stdout = "command output"
-        mock_process.returncode = 0
-        mock_run.return_value = mock_process
-        
-        result = _run_winget_command(["list"])
+        result = _run_winget_command(["install", "package"])
         assert result == "command output"
-        mock_run.assert_called_once()
+        mocks.run.assert_called_once()
+        assert mocks.run.call_args.args[0] == ["winget", "install", "package"]
+        assert mocks.run.call_args.kwargs["creationflags"] == service._CREATION_FLAGS
+
+    def test_run_winget_command_lines_streams(self, mocks):
+        process = mocks.popen.return_value
+        process.stdout = iter(["line1\n", "line2\n"])
+        process.returncode = 0
 
-    def test_run_winget_command_empty(self):
-        with pytest.raises(WingetCommandError, match="No command arguments provided"):
-            _run_winget_command([])
+        assert list(_run_winget_command_lines(["list"])) == ["line1", "line2"]
+        assert mocks.popen.call_args.args[0] == ["winget", "list"]
+        assert mocks.popen.call_args.kwargs["creationflags"] == service._CREATION_FLAGS
 
-    @patch("mcp_server_winget.service.subprocess.run")
-    def test_run_winget_command_with_error_output(self, mock_run):
-        mock_run.side_effect = subprocess.CalledProcessError(1, "winget", stderr="error output")
+    def test_run_winget_command_lines_error(self, mocks):
+        process = mocks.popen.return_value
+        process.stdout = iter(["error output\n"])
+        process.returncode = 1
+        process.args = ["winget", "invalid"]
         with pytest.raises(WingetCommandError):
-            _run_winget_command(["invalid"])
-
-    @patch("mcp_server_winget.service.subprocess.run")
-    def test_run_elevated_winget_command_success(self, mock_run):
-        mock_process = MagicMock()
-        mock_process.returncode = 0
-        mock_run.return_value = mock_process
-        
+            list(_run_winget_command_lines(["invalid"]))
+        assert mocks.popen.call_args.kwargs["stderr"] == subprocess.DEVNULL
+
+    def test_run_winget_command_with_error_output(self, mocks):
+        mocks.run.side_effect = subprocess.CalledProcessError(
+            1, ["winget", "install", "missing"], output="No package found\n", stderr=""
+        )
+        with pytest.raises(WingetCommandError, match="No package found"):
+            _run_winget_command(["install", "missing"])
+
+    def test_run_elevated_winget_command_success(self, mocks):
+        mocks.run.return_value = SimpleNamespace(stdout="", returncode=0, stderr="")
+
         result = _run_elevated_winget_command(["install", "package"])
         assert result == "Command completed successfully"
-        mock_run.assert_called_once()
+        mocks.run.assert_called_once()
+
+    @pytest.mark.parametrize("callable_,args,message", [
+        (_run_winget_command, ([],), "No command arguments provided"),
+        (_run_elevated_winget_command, ([],), "No command arguments provided"),
+        (install_package, ("",), "Package name cannot be empty"),
+        (uninstall_package, ("",), "Package name cannot be empty"),
+        (upgrade_package, ("",), "Package name cannot be empty"),
+        (add_source, ("", "https://test.com"), "Source name cannot be empty"),
+        (add_source, ("test-source", ""), "Source URL cannot be empty"),
+        (remove_source, ("",), "Source name cannot be empty"),
+    ])
+    def test_empty_arg_raises(self, callable_, args, message):
+        with pytest.raises(WingetCommandError, match=message):
+            callable_(*args)
 
-    def test_run_elevated_winget_command_empty(self):
-        with pytest.raises(WingetCommandError, match="No command arguments provided"):
-            _run_elevated_winget_command([])
+    def test_run_elevated_winget_command_payload(self, mocks):
+        mocks.which.side_effect = lambda name: {"winget": "C:\\winget.exe"}.get(name)
+        args = ["source", "remove", "--name", "b 'c"]
+        assert _run_elevated_winget_command(args) == "Command completed successfully"
+        mocks.run.assert_called_once()
+        argv = mocks.run.call_args[0][0]
+        assert argv[0] == "powershell.exe"
+        launcher = base64.b64decode(argv[-1]).decode("utf-16le")
+        assert launcher.startswith("$ErrorActionPreference = 'Stop'; ")
+        encoded = launcher.split("-EncodedCommand ")[1].split("'")[0]
+        session_script = base64.b64decode(encoded).decode("utf-16le")
+        payload = session_script.split("FromBase64String('")[1].split("'")[0]
+        assert json.loads(base64.b64decode(payload)) == {
+            "winget": "C:\\winget.exe",
+            "args": args,
+        }
 
-    @patch("mcp_server_winget.service._run_winget_command")
-    def test_list_installed_packages_success(self, mock_run):
-        mock_run.return_value = "package1 1.0.0\npackage2 2.0.0"
+    def test_run_elevated_winget_command_prefers_pwsh(self, mocks):
+        mocks.which.side_effect = lambda name: f"C:\\{name}.exe"
+        _run_elevated_winget_command(["source", "reset"])
+        assert mocks.run.call_args[0][0][0] == "C:\\pwsh.exe"
+
+    def test_list_installed_packages_skips_progress_bar(self, mocks):
+        mocks.run_lines.return_value = ["██████▒▒▒▒  1.00 MB / 2.00 MB", "package1 1.0.0"]
+        assert list_installed_packages() == ["package1 1.0.0"]
+
+    def test_list_installed_packages_large_output(self, mocks):
+        lines = ["Name Id Version Source", "-" * 22]
+        for i in range(10000):
+            lines.extend([f"Package{i} Pkg.{i} 1.{i} winget", "", "| --- |", "  \\  "])
+        mocks.run_lines.return_value = lines
+        result = list_installed_packages()
+        assert len(result) == 10002
+        assert result[2] == "Package0 Pkg.0 1.0 winget"
+        assert result[-1] == "Package9999 Pkg.9999 1.9999 winget"
+
+    def test_list_installed_packages_success(self, mocks):
+        mocks.run_lines.return_value = ["package1 1.0.0", "package2 2.0.0"]
         result = list_installed_packages()
         assert isinstance(result, list)
         assert len(result) == 2
         assert "package1 1.0.0" in result
         assert "package2 2.0.0" in result
 
-    @patch("mcp_server_winget.service._run_winget_command")
-    def test_list_installed_packages_empty(self, mock_run):
-        mock_run.return_value = ""
-        result = list_installed_packages()
-        assert isinstance(result, list)
-        assert len(result) == 0
-
-    @patch("mcp_server_winget.service._run_winget_command")
-    def test_list_installed_packages_malformed(self, mock_run):
-        mock_run.return_value = "| Name | Version |\n|------|---------|"
+    def test_list_installed_packages_malformed(self, mocks):
+        mocks.run_lines.return_value = ["| Name | Version |", "|------|---------|"]
         result = list_installed_packages()
         assert isinstance(result, list)
         assert len(result) == 0
 
-    @patch("mcp_server_winget.service._run_winget_command")
-    def test_list_sources_success(self, mock_run):
-        mock_run.return_value = "source1\nsource2"
+    def test_list_sources_success(self, mocks):
+        mocks.run_lines.return_value = ["source1", "  ", "source2\r"]
         result = list_sources()
         assert isinstance(result, list)
         assert len(result) == 2
-        assert "source1" in result
-        assert "source2" in result
-
-    @patch("mcp_server_winget.service._run_winget_command")
-    def test_list_sources_empty(self, mock_run):
-        mock_run.return_value = ""
-        result = list_sources()
-        assert isinstance(result, list)
-        assert len(result) == 0
-
-    @patch("mcp_server_winget.service._run_winget_command")
-    def test_install_package_success(self, mock_run):
-        mock_run.return_value = "Successfully installed package"
-        result = install_package("test-package")
-        assert result is True
+        assert result == ["source1", "source2"]
 
-    def test_install_package_empty_name(self):
-        with pytest.raises(WingetCommandError):
-            install_package("")
-
-    @patch("mcp_server_winget.service._run_winget_command")
-    def test_install_package_with_version(self, mock_run):
-        mock_run.return_value = "Successfully installed package"
-        result = install_package("test-package", "1.0.0")
-        assert result is True
-        mock_run.assert_called_with(["install", "test-package", "--version", "1.0.0"])
-
-    @patch("mcp_server_winget.service._run_winget_command")
-    def test_uninstall_package_success(self, mock_run):
-        mock_run.return_value = "Successfully uninstalled package"
-        result = uninstall_package("test-package")
-        assert result is True
-
-    def test_uninstall_package_empty_name(self):
-        with pytest.raises(WingetCommandError):
-            uninstall_package("")
+    def test_list_sources_translates_errors(self, mocks):
+        mocks.run_lines.side_effect = RuntimeError("boom")
+        with pytest.raises(WingetCommandError, match="Failed to list Winget sources: boom"):
+            list_sources()
+        mocks.run_lines.side_effect = WingetNotInstalledError("missing")
+        with pytest.raises(WingetNotInstalledError):
+            list_sources()
 
-    @patch("mcp_server_winget.service._run_winget_command")
-    def test_list_available_packages_success(self, mock_run):
-        mock_run.return_value = "package1\npackage2"
+    def test_list_available_packages_success(self, mocks):
+        mocks.run_lines.return_value = ["package1", "package2"]
         result = list_available_packages("test")
         assert isinstance(result, list)
         assert len(result) == 2
         assert "package1" in result
         assert "package2" in result
 
-    @patch("mcp_server_winget.service._run_winget_command")
-    def test_upgrade_package_success(self, mock_run):
-        mock_run.return_value = "Successfully upgraded package"
-        result = upgrade_package("test-package")
-        assert result is True
+    @pytest.mark.parametrize(
+        "fn",
+        [list_installed_packages, list_sources, lambda: list_available_packages("test")],
+        ids=["installed", "sources", "available"],
+    )
+    def test_list_empty(self, mocks, fn):
+        mocks.run_lines.return_value = []
+        assert fn() == []
 
-    def test_upgrade_package_empty_name(self):
-        with pytest.raises(WingetCommandError):
-            upgrade_package("")
-
-    @patch("mcp_server_winget.service._run_winget_command")
-    def test_upgrade_package_with_version(self, mock_run):
-        mock_run.return_value = "Successfully upgraded package"
-        result = upgrade_package("test-package", "1.0.0")
-        assert result is True
-        mock_run.assert_called_with(["upgrade", "test-package", "--version", "1.0.0"])
-
-    @patch("mcp_server_winget.service._run_elevated_winget_command")
-    def test_add_source_success(self, mock_run):
-        mock_run.return_value = "Command completed successfully"
-        result = add_source("test-source", "https://test.com")
-        assert result is True
-
-    def test_add_source_empty_name(self):
-        with pytest.raises(WingetCommandError):
-            add_source("", "https://test.com")
+    @pytest.mark.parametrize("fn,args,expected_call", [
+        (install_package, ("p",), ["install", "p"]),
+        (install_package, ("p", "1.0"), ["install", "p", "--version", "1.0"]),
+        (uninstall_package, ("p",), ["uninstall", "p"]),
+        (upgrade_package, ("p",), ["upgrade", "p"]),
+        (upgrade_package, ("p", "1.0"), ["upgrade", "p", "--version", "1.0"]),
+    ])
+    def test_package_ops(self, mocks, fn, args, expected_call):
+        mocks.run_winget.return_value = "Successfully done"
+        assert fn(*args) is True
+        mocks.run_winget.assert_called_with(expected_call)
 
-    def test_add_source_empty_url(self):
-        with pytest.raises(WingetCommandError):
-            add_source("test-source", "")
-
-    @patch("mcp_server_winget.service._run_elevated_winget_command")
-    def test_add_source_with_type(self, mock_run):
-        mock_run.return_value = "Command completed successfully"
-        result = add_source("test-source", "https://test.com", "custom-type")
-        assert result is True
-        mock_run.assert_called_with([
-            "source", "add", "--name", "test-source",
-            "--arg", "https://test.com", "--type", "custom-type"
-        ])
-
-    @patch("mcp_server_winget.service._run_elevated_winget_command")
-    def test_remove_source_success(self, mock_run):
-        mock_run.return_value = "Command completed successfully"
-        result = remove_source("test-source")
-        assert result is True
-
-    def test_remove_source_empty_name(self):
-        with pytest.raises(WingetCommandError):
-            remove_source("")
\ No newline at end of file
+    @pytest.mark.parametrize("fn,args,expected_call", [
+        (add_source, ("s", "https://test.com"),
+         ["source", "add", "--name", "s", "--arg", "https://test.com", "--type", "Microsoft.Rest"]),
+        (add_source, ("s", "https://test.com", "custom-type"),
+         ["source", "add", "--name", "s", "--arg", "https://test.com", "--type", "custom-type"]),
+        (remove_source, ("s",), ["source", "remove", "--name", "s"]),
+    ])
+    def test_source_ops(self, mocks, fn, args, expected_call):
+        assert fn(*args) is True
+        mocks.run_elevated.assert_called_with(expected_call)
+
+    @pytest.mark.parametrize("fn,args,runner", [
+        (install_package, ("p",), "run_winget"),
+        (upgrade_package, ("p",), "run_winget"),
+        (add_source, ("s", "https://test.com"), "run_elevated"),
+        (remove_source, ("s",), "run_elevated"),
+    ])
+    def test_changes_hold_change_lock(self, mocks, fn, args, runner):
+        getattr(mocks, runner).side_effect = lambda args: service._change_lock.locked() or pytest.fail("lock not held")
+        assert fn(*args) is True
+        assert not service._change_lock.locked()
+
+    def test_uninstall_package_failure_names_verb(self, mocks):
+        mocks.run_winget.side_effect = WingetCommandError("boom")
+        with pytest.raises(WingetCommandError, match="Failed to uninstall package test-package: boom"):
+            uninstall_package("test-package")
+        mocks.run_winget.assert_called_once_with(["uninstall", "test-package"])
+
+    def test_list_installed_packages_cached(self, mocks):
+        mocks.run_lines.return_value = ["package1 1.0.0"]
+        first = list_installed_packages()
+        first.append("mutated")
+        assert list_installed_packages() == ["package1 1.0.0"]
+        mocks.run_lines.assert_called_once_with(["list", "--disable-interactivity"])
+
+    def test_list_installed_packages_cache_expires(self, mocks, monkeypatch):
+        mocks.run_lines.return_value = ["package1 1.0.0"]
+        monkeypatch.setattr(service, "_RESULT_CACHE_TTL", 0.0)
+        list_installed_packages()
+        list_installed_packages()
+        assert mocks.run_lines.call_count == 2
+
+    def test_install_package_invalidates_cache(self, mocks):
+        mocks.run_lines.return_value = ["package1 1.0.0"]
+        list_installed_packages()
+        install_package("test-package")
+        list_installed_packages()
+        assert mocks.run_lines.call_count == 2
+
+    def test_remove_source_invalidates_cache(self, mocks):
+        mocks.run_lines.return_value = ["source1"]
+        list_sources()
+        remove_source("source1")
+        list_sources()
+        assert mocks.run_lines.call_count == 2
+
+    def test_list_installed_packages_disk_cache(self, mocks, monkeypatch, tmp_path):
+        monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+        mocks.run_lines.return_value = ["package1 1.0.0"]
+        assert list_installed_packages() == ["package1 1.0.0"]
+        assert (tmp_path / "mcp_server_winget" / "installed.json").exists()
+        service._result_cache.clear()  # as in a new server process
+        assert list_installed_packages() == ["package1 1.0.0"]
+        mocks.run_lines.assert_called_once()
+
+    def test_list_installed_packages_not_cached_across_clear(self, mocks, monkeypatch, tmp_path):
+        monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+
+        def list_then_install(args):
+            yield "package1 1.0.0"
+            install_package("test-package")  # finishes while winget list still runs
+
+        mocks.run_lines.side_effect = list_then_install
+        assert list_installed_packages() == ["package1 1.0.0"]
+        assert service._get_cached_result(("list", "--disable-interactivity")) is None
+        assert not (tmp_path / "mcp_server_winget" / "installed.json").exists()
+
+    def test_put_cached_result_drops_expired_entries(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("mcp_server_winget.service.time.monotonic", lambda: now[0])
+        generation = service._get_cache_generation()
+        service._put_cached_result(("search", "a"), ["a"], generation)
+        now[0] += service._RESULT_CACHE_TTL
+        service._put_cached_result(("search", "b"), ["b"], generation)
+        assert list(service._result_cache) == [("search", "b")]
+
+    def test_disk_cache_concurrent_writers(self, monkeypatch, tmp_path):
+        import threading
+        monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+        generation = service._get_cache_generation()
+        threads = [
+            threading.Thread(target=service._put_disk_cached_result, args=(("list", str(i)), [str(i)] * 1000, generation))
+            for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        cache_dir = tmp_path / "mcp_server_winget"
+        assert json.loads((cache_dir / "installed.json").read_text(encoding="utf-8"))
+        assert not list(cache_dir.glob("*.tmp"))
+
+    def test_install_package_removes_disk_cache(self, mocks, monkeypatch, tmp_path):
+        monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+        mocks.run_lines.return_value = ["package1 1.0.0"]
+        list_installed_packages()
+        install_package("test-package")
+        assert not (tmp_path / "mcp_server_winget" / "installed.json").exists()
+
+    def test_list_installed_packages_ignores_corrupt_disk_cache(self, mocks, monkeypatch, tmp_path):
+        monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+        cache_file = tmp_path / "mcp_server_winget" / "installed.json"
+        cache_file.parent.mkdir()
+        cache_file.write_text("not json", encoding="utf-8")
+        mocks.run_lines.return_value = ["package1 1.0.0"]
+        assert list_installed_packages() == ["package1 1.0.0"]
+        mocks.run_lines.assert_called_once()
+
+    def test_list_available_packages_no_match(self, mocks):
+        mocks.run_lines.return_value = ["No package found matching input criteria.", "  ", "| --- |"]
+        assert list_available_packages("missing") == []